@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+시트 읽기 방식(api, csv, openpyxl, calamine) 벤치마크
+
+- synthetic: 실제 시트와 같은 컬럼 구성의 시트를 메모리에서 만들어 파서만 비교 (네트워크 없음)
+    python -m src.benchmark_readers synthetic --rows 1000 5000 20000
+- live: 설정된 스프레드시트의 시트를 방식별로 실제로 읽어 내보내기/전송 시간까지 비교
+    python -m src.benchmark_readers live --sheet "7월17일" --repeat 3
+"""
+
+import io
+import csv
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+from dotenv import load_dotenv
+from openpyxl import Workbook
+
+from .column_mappings import get_column_mapping_config
+from .sheet_readers import READERS, SheetReadRequest, calamine_available, parse_csv, parse_xlsx_calamine, parse_xlsx_openpyxl
+
+# 실제 시트에 있지만 매핑에서 사용하지 않는 컬럼 (읽지 않고 건너뛰는 비용도 측정에 포함)
+UNUSED_COLUMNS = ['No', '담당자', '진행상황', '메모', '회신일']
+
+
+def _timed(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """함수를 repeat번 실행해 중앙값/최소 시간(초)을 반환합니다."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - started)
+    return {'median': statistics.median(times), 'min': min(times), 'result': result}
+
+
+def build_synthetic_sheet(rows: int, header_row: int = 1, seed: int = 0) -> List[List[object]]:
+    """
+    컬럼 매핑 설정과 같은 컬럼 구성(이름, 전화번호, 문의, 지역 등)의 시트 값을 만듭니다.
+
+    :param rows: 데이터 행 수
+    :param header_row: 헤더 위에 둘 제목 행 수 (시트 기본 헤더 위치와 동일하게 1)
+    :return: 헤더를 포함한 행 리스트
+    """
+    rng = random.Random(seed)
+    mapping_config = get_column_mapping_config()
+    columns, _ = mapping_config.read_columns(mapping_config.mappings.values())
+    header = sorted(columns) + UNUSED_COLUMNS
+    started = datetime(2025, 7, 17, 9, 0)
+
+    values: List[List[object]] = [['접수 현황'] + [''] * (len(header) - 1) for _ in range(header_row)]
+    values.append(header)
+    for i in range(rows):
+        row = []
+        for col in header:
+            if col == '이름':
+                row.append(f"고객{i:06d}")
+            elif col in ('전화번호', '연락처'):
+                row.append(f"010-{rng.randint(0, 9999):04d}-{rng.randint(0, 9999):04d}")
+            elif col == '신청일시':
+                row.append((started + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S'))
+            elif col == '설치대수':
+                row.append(str(rng.randint(1, 16)))
+            else:
+                row.append(rng.choice(['', f"{col} {rng.randint(1, 500)}"]))
+        values.append(row)
+    return values
+
+
+def _to_csv(values: List[List[object]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(values)
+    return buffer.getvalue().encode('utf-8')
+
+
+def _to_xlsx(values: List[List[object]], sheet_name: str) -> bytes:
+    book = Workbook(write_only=True)
+    sheet = book.create_sheet(title=sheet_name)
+    for row in values:
+        sheet.append([cell if cell != '' else None for cell in row])
+    buffer = io.BytesIO()
+    book.save(buffer)
+    return buffer.getvalue()
+
+
+def run_synthetic(row_counts: List[int], repeat: int) -> None:
+    """메모리에서 만든 시트로 CSV/엑셀 파서를 비교합니다."""
+    mapping_config = get_column_mapping_config()
+    columns, text_columns = mapping_config.read_columns(mapping_config.mappings.values())
+    sheet_name, header_row = 'benchmark', 1
+
+    print(f"{'행 수':>8} {'방식':<10} {'크기(KB)':>10} {'중앙값(ms)':>12} {'최소(ms)':>10} {'결과 행':>8}")
+    for rows in row_counts:
+        values = build_synthetic_sheet(rows, header_row)
+        content = _to_csv(values)
+        workbook = _to_xlsx(values, sheet_name)
+
+        parsers = {
+            # 기존 방식: pd.read_excel 기본 엔진(openpyxl)으로 시트 전체를 파싱
+            'read_excel': (len(workbook), lambda: pd.read_excel(io.BytesIO(workbook), sheet_name=sheet_name, skiprows=header_row,
+                                                               usecols=lambda col: col in columns,
+                                                               dtype={col: str for col in text_columns})),
+            'csv': (len(content), lambda: parse_csv(content, header_row, columns)[0]),
+            'openpyxl': (len(workbook), lambda: parse_xlsx_openpyxl(workbook, sheet_name, header_row, columns, text_columns)),
+        }
+        if calamine_available():
+            parsers['calamine'] = (len(workbook), lambda: parse_xlsx_calamine(workbook, sheet_name, header_row, columns, text_columns))
+
+        for name, (size, parse) in parsers.items():
+            timing = _timed(parse, repeat)
+            print(f"{rows:>8} {name:<10} {size / 1024:>10.0f} {timing['median'] * 1000:>12.1f} "
+                  f"{timing['min'] * 1000:>10.1f} {len(timing['result']):>8}")
+    if not calamine_available():
+        print("(calamine: python-calamine 미설치 또는 pandas 2.2 미만이라 제외)")
+
+
+def run_live(sheet: Optional[str], repeat: int) -> None:
+    """설정된 스프레드시트의 시트를 방식별로 실제로 읽어 비교합니다. (엑셀 방식은 내보내기 시간 포함)"""
+    from .runtime import SyncRuntime
+    from .main import SourceSnapshot, select_recent_sheets
+
+    runtime = SyncRuntime()
+    print(f"{'스프레드시트':<16} {'시트':<12} {'행 수':>8} {'방식':<10} {'중앙값(ms)':>12} {'최소(ms)':>10} {'결과 행':>8}")
+    for source in runtime.sources:
+        gs_manager = runtime.get_gs_manager(source)
+        catalog = gs_manager.get_sheet_catalog()
+        if not catalog:
+            print(f"[{source.name}] 시트 목록을 가져오지 못했습니다.")
+            continue
+        sheet_name = sheet or source.sheet_name or select_recent_sheets(catalog, datetime.now())[0]
+        snapshot = SourceSnapshot(source, gs_manager, None)
+        sheet_info = catalog.get(sheet_name) or {}
+
+        for name, reader in READERS.items():
+            request = SheetReadRequest(sheet_name, header_row=source.get_header_row(sheet_name),
+                                       columns=snapshot.columns, text_columns=snapshot.text_columns,
+                                       sheet_info=sheet_info)
+            if not reader.available(request):
+                continue
+            timing = _timed(lambda: reader.read(gs_manager, request)[0], repeat)
+            rows = len(timing['result']) if timing['result'] is not None else '실패'
+            print(f"{source.name[:16]:<16} {sheet_name[:12]:<12} {str(sheet_info.get('row_count')):>8} {name:<10} "
+                  f"{timing['median'] * 1000:>12.1f} {timing['min'] * 1000:>10.1f} {rows:>8}")
+    print(runtime.api_limiter.usage_summary())
+
+
+def main():
+    """메인 함수"""
+    load_dotenv()
+    parser = argparse.ArgumentParser(description='시트 읽기 방식 벤치마크')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    synthetic = subparsers.add_parser('synthetic', help='메모리에서 만든 시트로 파서만 비교')
+    synthetic.add_argument('--rows', type=int, nargs='+', default=[1000, 5000, 20000], help='데이터 행 수')
+    synthetic.add_argument('--repeat', type=int, default=3, help='반복 횟수')
+
+    live = subparsers.add_parser('live', help='설정된 스프레드시트를 실제로 읽어 비교')
+    live.add_argument('--sheet', help='읽을 시트 이름 (기본값: 오늘 날짜 시트)')
+    live.add_argument('--repeat', type=int, default=3, help='반복 횟수')
+
+    args = parser.parse_args()
+    if args.command == 'synthetic':
+        run_synthetic(args.rows, args.repeat)
+    else:
+        run_live(args.sheet, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
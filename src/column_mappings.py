@@ -0,0 +1,218 @@
+import os
+import json
+import logging
+import threading
+from typing import Optional, List, Dict, Any, Callable, Iterable, Set, Tuple
+
+import pandas as pd
+
+from .identity import normalize_name_series, normalize_phone_series
+
+logger = logging.getLogger(__name__)
+
+# 기본 컬럼 매핑 설정 파일 (프로젝트 루트 기준)
+DEFAULT_COLUMN_MAPPINGS_FILE = 'config/column_mappings.json'
+
+
+def _has_value(series: pd.Series) -> pd.Series:
+    """값이 비어 있지 않은(None/NaN/빈 문자열/0이 아닌) 행의 마스크를 반환합니다."""
+    return series.notna() & series.astype(object).astype(bool)
+
+
+def _to_datetime_string(series: pd.Series) -> pd.Series:
+    """날짜/시간으로 해석되는 값은 ISO 형식 문자열로 바꾸고, 해석되지 않는 값은 원래 문자열을 유지합니다."""
+    parsed = pd.to_datetime(series, errors='coerce', format='mixed')
+    converted = parsed.dt.strftime('%Y-%m-%dT%H:%M:%S').astype(object)
+    fallback = series.where(series.isna(), series.astype(str)).astype(object)
+    return converted.where(parsed.notna(), fallback)
+
+
+# 설정 파일의 "converters"에서 사용할 수 있는 컬럼 변환기 (Series 단위로 적용, 변환 실패 값은 null)
+CONVERTERS: Dict[str, Callable[[pd.Series], pd.Series]] = {
+    'str': lambda series: series.where(series.isna(), series.astype(str).str.strip()),
+    'int': lambda series: pd.to_numeric(series, errors='coerce').astype('Int64'),
+    'float': lambda series: pd.to_numeric(series, errors='coerce'),
+    'digits': lambda series: series.where(series.isna(), series.astype(str).str.replace(r'\D', '', regex=True)),
+    'datetime': _to_datetime_string,
+}
+
+
+def mapping_signature(mapping: Dict[str, Any]) -> Tuple:
+    """같은 추출 규칙을 쓰는 컬럼 매핑을 구별하기 위한 키를 반환합니다."""
+    return (mapping['name_col'], mapping['phone_col'], tuple(mapping['required_cols']),
+            tuple(mapping.get('extra_fields', {}).items()), tuple(sorted(mapping.get('converters', {}).items())))
+
+
+class ExtractionPlan:
+    """
+    컬럼 매핑 하나를 특정 시트 헤더(컬럼 순서)에 맞춰 컴파일한 추출 계획
+
+    컬럼 이름은 컴파일할 때 한 번만 위치로 해석하므로, 추출할 때는 행마다 컬럼을 찾지 않고
+    위치로 컬럼 전체를 가져와 변환합니다.
+    """
+
+    def __init__(self, mapping: Dict[str, Any], columns: Tuple[Any, ...]):
+        """
+        ExtractionPlan을 초기화합니다.
+
+        :param mapping: 컬럼 매핑 (name_col, phone_col, required_cols, extra_fields, converters)
+        :param columns: 시트 헤더의 컬럼 이름 (순서대로)
+        """
+        # 같은 이름의 컬럼이 여러 개면 첫 번째 컬럼을 사용
+        positions: Dict[Any, int] = {}
+        for i, col in enumerate(columns):
+            positions.setdefault(col, i)
+
+        self.missing_cols = [col for col in mapping['required_cols'] if col not in positions]
+        self.name_pos = positions.get(mapping['name_col'])
+        self.phone_pos = positions.get(mapping['phone_col'])
+
+        converters = mapping.get('converters', {})
+        unknown = [name for name in converters.values() if name not in CONVERTERS]
+        if unknown:
+            raise ValueError(f"알 수 없는 컬럼 변환기입니다: {unknown} (사용 가능: {list(CONVERTERS)})")
+
+        # (DB 필드, 컬럼 위치, 변환기) - 시트에 없는 추가 필드는 제외
+        self.extra_fields = [(db_field, positions[sheet_col], CONVERTERS.get(converters.get(db_field)))
+                             for db_field, sheet_col in mapping.get('extra_fields', {}).items() if sheet_col in positions]
+
+    def extract(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        시트에서 신규 후보 행을 추출합니다. (유효성 검사, 이름/연락처 정규화, 추가 필드 선택/변환)
+
+        :param df: 컴파일할 때와 같은 헤더를 가진 시트 DataFrame
+        :return: name, phone(정규화됨), 추가 필드 컬럼으로 이루어진 DataFrame 또는 필수 컬럼이 없으면 None
+        """
+        if self.missing_cols or self.name_pos is None or self.phone_pos is None:
+            return None
+
+        raw_names = df.iloc[:, self.name_pos]
+        raw_phones = df.iloc[:, self.phone_pos]
+
+        # DB의 기존 식별자와 같은 규칙으로 정규화 (identity 모듈)
+        names = normalize_name_series(raw_names)
+        phones = normalize_phone_series(raw_phones)
+
+        # 필수 값 유효성 검사 (이름과 연락처가 모두 있는 행만)
+        valid = (_has_value(raw_names) & _has_value(raw_phones) & (names != '') & (phones != '')).to_numpy()
+        candidates = pd.DataFrame({'name': names[valid], 'phone': phones[valid]})
+
+        for db_field, position, converter in self.extra_fields:
+            values = df.iloc[valid, position]
+            candidates[db_field] = (converter(values) if converter else values).array
+        return candidates
+
+
+class ColumnMappingConfig:
+    """
+    설정 파일에서 불러온 inquiry_type 목록, 컬럼 매핑, 헤더 행 규칙을 보관하는 클래스
+
+    컬럼 매핑은 시트 헤더별로 ExtractionPlan으로 컴파일해 캐시하므로, 같은 헤더의 시트를
+    다시 읽을 때는 컬럼 위치를 다시 찾지 않습니다. 새 inquiry_type은 설정 파일에 항목만 추가하면 됩니다.
+    """
+
+    def __init__(self, inquiry_types: List[Dict[str, Any]], header_rows: Optional[Dict[str, Any]] = None):
+        """
+        ColumnMappingConfig를 초기화합니다.
+
+        :param inquiry_types: inquiry_type 설정 리스트 (view, type, name_col, phone_col, required_cols,
+                              extra_fields, converters, summary_field)
+        :param header_rows: {'default': 기본 헤더 행 위치, 'sheets': {시트이름: 헤더 행 위치}} (0부터 시작)
+        """
+        header_rows = header_rows or {}
+        self.default_header_row = header_rows.get('default', 1)
+        self.sheet_header_rows = header_rows.get('sheets', {})
+
+        # 뷰 이름 -> inquiry_type
+        self.inquiry_types: Dict[str, str] = {}
+        # inquiry_type -> 컬럼 매핑
+        self.mappings: Dict[str, Dict[str, Any]] = {}
+        self._summary_fields: Dict[str, Dict[str, str]] = {}
+        for entry in inquiry_types:
+            view_name, inquiry_type = entry['view'], entry['type']
+            self.inquiry_types[view_name] = inquiry_type
+            self.mappings[inquiry_type] = {
+                'name_col': entry['name_col'],
+                'phone_col': entry['phone_col'],
+                'required_cols': entry.get('required_cols', [entry['name_col'], entry['phone_col']]),
+                'extra_fields': entry.get('extra_fields', {}),
+                'converters': entry.get('converters', {})
+            }
+            if entry.get('summary_field'):
+                self._summary_fields[inquiry_type] = entry['summary_field']
+
+        self._plans: Dict[Tuple, ExtractionPlan] = {}
+        self._lock = threading.Lock()
+
+    def get_header_row(self, sheet_name: str) -> int:
+        """시트별 헤더 행 위치를 반환합니다."""
+        return self.sheet_header_rows.get(sheet_name, self.default_header_row)
+
+    def summary_field(self, inquiry_type: str) -> Optional[Dict[str, str]]:
+        """알림에 함께 표시할 필드 ({'field', 'label'})를 반환합니다."""
+        return self._summary_fields.get(inquiry_type)
+
+    @staticmethod
+    def read_columns(mappings: Iterable[Dict[str, Any]]) -> Tuple[Set[str], Set[str]]:
+        """
+        컬럼 매핑들이 사용하는 시트 컬럼을 반환합니다. 시트를 읽을 때 이 컬럼만 가져오고,
+        식별자(이름/연락처) 컬럼은 숫자로 추론되지 않도록 문자열로 읽는 데 사용합니다.
+
+        :param mappings: 컬럼 매핑 목록
+        :return: (읽을 컬럼 집합, 그 중 문자열로 읽을 식별자 컬럼 집합)
+        """
+        columns, identifier_columns = set(), set()
+        for mapping in mappings:
+            identifier_columns.update([mapping['name_col'], mapping['phone_col']])
+            columns.update(mapping['required_cols'])
+            columns.update(mapping.get('extra_fields', {}).values())
+        columns.update(identifier_columns)
+        return columns, identifier_columns
+
+    def compile(self, mapping: Dict[str, Any], columns) -> ExtractionPlan:
+        """
+        컬럼 매핑을 시트 헤더에 맞춰 컴파일합니다. 같은 매핑과 헤더 조합은 캐시된 계획을 반환합니다.
+
+        :param mapping: 컬럼 매핑
+        :param columns: 시트 DataFrame의 컬럼
+        :return: ExtractionPlan
+        """
+        key = (mapping_signature(mapping), tuple(columns))
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                plan = self._plans[key] = ExtractionPlan(mapping, key[1])
+            return plan
+
+
+def load_column_mapping_config(config_path: Optional[str] = None) -> ColumnMappingConfig:
+    """
+    컬럼 매핑 설정 파일을 불러옵니다.
+
+    :param config_path: 설정 파일 경로 (기본값: 환경변수 COLUMN_MAPPINGS_FILE 또는 config/column_mappings.json)
+    :return: ColumnMappingConfig
+    """
+    config_path = config_path or os.getenv('COLUMN_MAPPINGS_FILE') or DEFAULT_COLUMN_MAPPINGS_FILE
+    if not os.path.isabs(config_path):
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        config_path = os.path.join(project_root, config_path)
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    mapping_config = ColumnMappingConfig(config['inquiry_types'], config.get('header_rows'))
+    logger.info(f"컬럼 매핑 설정을 불러왔습니다 ({config_path}): {list(mapping_config.mappings)}")
+    return mapping_config
+
+
+_config: Optional[ColumnMappingConfig] = None
+_config_lock = threading.Lock()
+
+
+def get_column_mapping_config() -> ColumnMappingConfig:
+    """프로세스 전체가 공유하는 컬럼 매핑 설정을 반환합니다. (처음 사용할 때 한 번만 불러옴)"""
+    global _config
+    with _config_lock:
+        if _config is None:
+            _config = load_column_mapping_config()
+        return _config
@@ -0,0 +1,224 @@
+import os
+import io
+import gzip
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+import zipfile
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any
+
+
+class DownloadArchive:
+    """
+    다운로드한 엑셀 파일을 내용 해시 기준으로 압축 보관하는 클래스
+
+    같은 내용의 스냅샷은 한 번만 저장하고, index.json에 실행 시각별로 어떤 blob을 가리키는지 기록합니다.
+    보관 기간(일)과 최대 용량을 넘은 오래된 기록은 prune()으로 정리합니다.
+
+    구조:
+        downloads/index.json
+        downloads/blobs/ab/abcdef....xlsx.gz
+    """
+
+    def __init__(self, root_dir: str = "downloads", retention_days: Optional[float] = None,
+                 max_bytes: Optional[int] = None, compression_level: Optional[int] = None):
+        """
+        DownloadArchive를 초기화합니다.
+
+        :param root_dir: 보관 루트 디렉토리
+        :param retention_days: 보관 기간 (기본값: 환경변수 ARCHIVE_RETENTION_DAYS 또는 30, 0이면 무제한)
+        :param max_bytes: 최대 보관 용량 (기본값: 환경변수 ARCHIVE_MAX_MB 기준, 0이면 무제한)
+        :param compression_level: gzip 압축 레벨 (기본값: 환경변수 ARCHIVE_COMPRESSION_LEVEL 또는 6)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.root_dir = root_dir
+        self.index_path = os.path.join(root_dir, 'index.json')
+        self.retention_days = retention_days if retention_days is not None else float(os.getenv('ARCHIVE_RETENTION_DAYS', '30'))
+        self.max_bytes = max_bytes if max_bytes is not None else int(float(os.getenv('ARCHIVE_MAX_MB', '0')) * 1024 * 1024)
+        self.compression_level = compression_level if compression_level is not None else int(os.getenv('ARCHIVE_COMPRESSION_LEVEL', '6'))
+
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Any]:
+        """index.json을 읽습니다. 없거나 손상된 경우 빈 인덱스로 시작합니다."""
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                index.setdefault('blobs', {})
+                index.setdefault('runs', [])
+                return index
+            except Exception as e:
+                self.logger.warning(f"보관 인덱스를 읽을 수 없어 새로 만듭니다: {e}")
+        return {'blobs': {}, 'runs': []}
+
+    def _save_index(self) -> None:
+        """
+        인덱스를 같은 디렉토리의 고유한 임시 파일에 쓰고 디스크에 반영한 뒤 os.replace로 교체합니다.
+        (쓰는 도중 중단되거나 여러 프로세스가 동시에 저장해도 index.json은 항상 완전한 이전 또는 새 내용)
+        """
+        os.makedirs(self.root_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='index.', suffix='.json.tmp', dir=self.root_dir)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f, ensure_ascii=False, indent=1)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        """
+        보관 파일의 내용 해시를 계산합니다.
+        엑셀(zip) 파일은 저장 시각이 기록되는 docProps/ 항목을 제외한 내용만 해시하므로,
+        셀 값이 같으면 내보낸 시각이 달라도 같은 해시가 나옵니다.
+
+        :param data: 파일 내용
+        :return: sha256 16진수 문자열
+        """
+        digest = hashlib.sha256()
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                for name in sorted(zf.namelist()):
+                    if name.startswith('docProps/'):
+                        continue
+                    digest.update(name.encode('utf-8'))
+                    digest.update(zf.read(name))
+            return digest.hexdigest()
+        except zipfile.BadZipFile:
+            return hashlib.sha256(data).hexdigest()
+
+    def _blob_path(self, sha256: str) -> str:
+        """내용 해시에 해당하는 blob 파일 경로를 반환합니다."""
+        return os.path.join(self.root_dir, 'blobs', sha256[:2], f"{sha256}.xlsx.gz")
+
+    def store(self, data: bytes, label: str, kind: str = 'workbook') -> Optional[str]:
+        """
+        파일 내용을 보관합니다. 같은 내용이 이미 있으면 새로 쓰지 않고 인덱스에 실행 기록만 추가합니다.
+
+        :param data: 보관할 파일 내용
+        :param label: 기록용 이름 (스프레드시트 또는 시트 이름)
+        :param kind: 'workbook' 또는 'sheet'
+        :return: blob 파일 경로 또는 실패 시 None
+        """
+        try:
+            sha256 = self.content_hash(data)
+            blob_path = self._blob_path(sha256)
+
+            with self._lock:
+                if sha256 not in self._index['blobs'] or not os.path.exists(blob_path):
+                    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                    tmp_path = f"{blob_path}.tmp"
+                    with open(tmp_path, 'wb') as f:
+                        f.write(gzip.compress(data, compresslevel=self.compression_level))
+                    os.replace(tmp_path, blob_path)
+                    self._index['blobs'][sha256] = {
+                        'path': os.path.relpath(blob_path, self.root_dir),
+                        'size': os.path.getsize(blob_path),
+                        'original_size': len(data)
+                    }
+                    self.logger.info(f"'{label}' 스냅샷을 새로 보관했습니다: {blob_path}")
+                else:
+                    self.logger.info(f"'{label}' 스냅샷이 기존과 동일하여 저장을 건너뜁니다 ({sha256[:12]}).")
+
+                self._index['runs'].append({
+                    'timestamp': datetime.now().isoformat(timespec='seconds'),
+                    'label': label,
+                    'kind': kind,
+                    'sha256': sha256
+                })
+                self._save_index()
+
+            return blob_path
+
+        except Exception as e:
+            self.logger.error(f"'{label}' 보관 실패: {e}")
+            return None
+
+    def read(self, sha256: str) -> Optional[bytes]:
+        """
+        보관된 blob의 원본 내용을 반환합니다.
+
+        :param sha256: 내용 해시
+        :return: 압축을 푼 파일 내용 또는 없으면 None
+        """
+        blob_path = self._blob_path(sha256)
+        if not os.path.exists(blob_path):
+            return None
+        with open(blob_path, 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def prune(self) -> int:
+        """
+        보관 기간이 지났거나 최대 용량을 넘는 오래된 실행 기록을 지우고, 더 이상 참조되지 않는 blob을 삭제합니다.
+
+        :return: 삭제한 blob 수
+        """
+        with self._lock:
+            runs = self._index['runs']
+
+            if self.retention_days > 0:
+                cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat(timespec='seconds')
+                runs = [run for run in runs if run['timestamp'] >= cutoff]
+
+            if self.max_bytes > 0:
+                # 최신 기록부터 용량을 누적해 한도를 넘는 지점 이전 기록은 버림
+                kept_runs = []
+                kept_blobs = set()
+                total_bytes = 0
+                for run in reversed(runs):
+                    sha256 = run['sha256']
+                    if sha256 not in kept_blobs:
+                        blob_size = self._index['blobs'].get(sha256, {}).get('size', 0)
+                        if total_bytes + blob_size > self.max_bytes:
+                            break
+                        total_bytes += blob_size
+                        kept_blobs.add(sha256)
+                    kept_runs.append(run)
+                runs = list(reversed(kept_runs))
+
+            referenced = {run['sha256'] for run in runs}
+            removed = 0
+            for sha256 in list(self._index['blobs']):
+                if sha256 in referenced:
+                    continue
+                blob_path = self._blob_path(sha256)
+                try:
+                    if os.path.exists(blob_path):
+                        os.remove(blob_path)
+                    removed += 1
+                except OSError as e:
+                    self.logger.warning(f"보관 파일 삭제 실패 ({blob_path}): {e}")
+                    continue
+                del self._index['blobs'][sha256]
+
+            self._index['runs'] = runs
+            self._save_index()
+
+        if removed:
+            self.logger.info(f"🧹 보관 정책에 따라 {removed}개의 오래된 스냅샷을 정리했습니다.")
+        return removed
+
+
+_archives: Dict[str, DownloadArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(root_dir: str = "downloads") -> DownloadArchive:
+    """
+    보관 디렉토리별로 하나의 DownloadArchive 인스턴스를 반환합니다.
+    여러 스프레드시트가 같은 index.json을 동시에 갱신하므로 인스턴스(와 잠금)를 공유해야 합니다.
+    """
+    key = os.path.abspath(root_dir)
+    with _archives_lock:
+        if key not in _archives:
+            _archives[key] = DownloadArchive(root_dir)
+        return _archives[key]
@@ -0,0 +1,188 @@
+import os
+import time
+import random
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+# 재시도할 HTTP 상태 코드 (쿼터 초과 및 일시적 서버 오류)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """분당 허용량을 초당 속도로 나눠 채우는 토큰 버킷"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        TokenBucket을 초기화합니다.
+
+        :param capacity: 버킷 크기 (한 번에 몰아 쓸 수 있는 최대 단위 수)
+        :param refill_per_second: 초당 채워지는 단위 수
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, units: float = 1) -> float:
+        """
+        단위를 확보할 때까지 기다린 뒤 차감합니다.
+
+        :param units: 사용할 단위 수
+        :return: 기다린 시간 (초)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_per_second)
+                self._updated_at = now
+                if self._tokens >= units:
+                    self._tokens -= units
+                    return waited
+                wait_time = (units - self._tokens) / self.refill_per_second
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def drain(self) -> None:
+        """쿼터 초과 응답을 받았을 때 남은 토큰을 비워 다른 요청도 속도를 늦추게 합니다."""
+        with self._lock:
+            self._tokens = 0
+            self._updated_at = time.monotonic()
+
+
+class GoogleApiLimiter:
+    """
+    모든 Google Sheets/Drive API 호출이 공유하는 요청 실행기
+
+    API별 분당 쿼터에 맞춘 토큰 버킷으로 요청 속도를 제한하고, 429/5xx와 네트워크 오류는
+    지터를 섞은 지수 백오프로 재시도합니다. 동기화 주기별로 사용한 쿼터 단위를 집계합니다.
+    """
+
+    def __init__(self, quotas_per_minute: Optional[Dict[str, float]] = None, max_retries: Optional[int] = None,
+                 base_delay: Optional[float] = None, max_delay: Optional[float] = None):
+        """
+        GoogleApiLimiter를 초기화합니다.
+
+        :param quotas_per_minute: API별 분당 쿼터 (기본값: 환경변수 GOOGLE_SHEETS_QUOTA_PER_MINUTE, GOOGLE_DRIVE_QUOTA_PER_MINUTE)
+        :param max_retries: 최대 재시도 횟수 (기본값: 환경변수 GOOGLE_API_MAX_RETRIES 또는 5)
+        :param base_delay: 첫 재시도 대기 시간 (초, 기본값: 환경변수 GOOGLE_API_BACKOFF_BASE 또는 1)
+        :param max_delay: 최대 재시도 대기 시간 (초, 기본값: 환경변수 GOOGLE_API_BACKOFF_MAX 또는 60)
+        """
+        self.logger = logging.getLogger(__name__)
+        quotas_per_minute = quotas_per_minute or {
+            'sheets': float(os.getenv('GOOGLE_SHEETS_QUOTA_PER_MINUTE', '60')),
+            'drive': float(os.getenv('GOOGLE_DRIVE_QUOTA_PER_MINUTE', '600')),
+        }
+        self.buckets = {api: TokenBucket(quota, quota / 60.0) for api, quota in quotas_per_minute.items()}
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('GOOGLE_API_MAX_RETRIES', '5'))
+        self.base_delay = base_delay if base_delay is not None else float(os.getenv('GOOGLE_API_BACKOFF_BASE', '1'))
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv('GOOGLE_API_BACKOFF_MAX', '60'))
+
+        self._usage_lock = threading.Lock()
+        self._usage: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """응답의 Retry-After 헤더 값을 초 단위로 반환합니다."""
+        if isinstance(error, HttpError):
+            value = error.resp.get('retry-after')
+            if value:
+                try:
+                    return float(value)
+                except ValueError:
+                    return None
+        return None
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """재시도할 수 있는 오류인지 판단합니다."""
+        if isinstance(error, HttpError):
+            return error.resp.status in RETRYABLE_STATUS_CODES
+        return isinstance(error, (TimeoutError, ConnectionError, httplib2.HttpLib2Error))
+
+    def _record(self, api: str, key: str, amount: float) -> None:
+        """주기별 사용량을 집계합니다."""
+        with self._usage_lock:
+            usage = self._usage.setdefault(api, {'units': 0, 'retries': 0, 'throttled_seconds': 0.0})
+            usage[key] += amount
+
+    def call(self, func: Callable[[], Any], api: str = 'sheets', units: float = 1, label: str = '') -> Any:
+        """
+        요청 함수를 쿼터 제한과 재시도 정책에 따라 실행합니다.
+
+        :param func: 실행할 함수 (예: request.execute, downloader.next_chunk)
+        :param api: 쿼터를 차감할 API 이름 ('sheets' 또는 'drive')
+        :param units: 이 요청이 사용하는 쿼터 단위 수
+        :param label: 로그에 표시할 요청 이름
+        :return: 함수의 반환값 (재시도를 모두 실패하면 마지막 예외를 발생시킴)
+        """
+        bucket = self.buckets.get(api)
+        attempt = 0
+        while True:
+            if bucket:
+                waited = bucket.acquire(units)
+                if waited:
+                    self._record(api, 'throttled_seconds', waited)
+            self._record(api, 'units', units)
+
+            try:
+                return func()
+            except Exception as e:
+                attempt += 1
+                if not self.is_retryable(e) or attempt > self.max_retries:
+                    raise
+
+                if isinstance(e, HttpError) and e.resp.status == 429 and bucket:
+                    bucket.drain()
+                delay = self._retry_after(e)
+                if delay is None:
+                    # 지터를 섞은 지수 백오프 (full jitter)
+                    delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+                self._record(api, 'retries', 1)
+                self.logger.warning(f"Google API 일시적 오류{f' ({label})' if label else ''}. "
+                                    f"{delay:.1f}초 후 재시도합니다... ({attempt}/{self.max_retries}): {e}")
+                time.sleep(delay)
+
+    def execute(self, request, api: str = 'sheets', units: float = 1, label: str = '') -> Any:
+        """
+        googleapiclient 요청 객체를 쿼터 제한과 재시도 정책에 따라 실행합니다.
+
+        :param request: googleapiclient HttpRequest
+        :return: 응답 데이터
+        """
+        return self.call(request.execute, api=api, units=units, label=label)
+
+    def reset_usage(self) -> Dict[str, Dict[str, float]]:
+        """
+        주기별 사용량 집계를 초기화하고, 초기화 전 집계를 반환합니다.
+
+        :return: {API 이름: {'units', 'retries', 'throttled_seconds'}}
+        """
+        with self._usage_lock:
+            usage, self._usage = self._usage, {}
+        return usage
+
+    def usage_summary(self) -> str:
+        """현재 주기의 API 사용량을 로그용 문자열로 반환합니다."""
+        with self._usage_lock:
+            parts = [f"{api}: {int(usage['units'])}단위 (재시도 {int(usage['retries'])}회, 대기 {usage['throttled_seconds']:.1f}초)"
+                     for api, usage in self._usage.items()]
+        return ', '.join(parts) if parts else '호출 없음'
+
+
+_limiter: Optional[GoogleApiLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_google_api_limiter() -> GoogleApiLimiter:
+    """프로세스 전체가 공유하는 GoogleApiLimiter를 반환합니다. (쿼터는 서비스 계정 단위로 적용되므로 공유해야 함)"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = GoogleApiLimiter()
+        return _limiter
@@ -14,23 +14,41 @@ import os
 import re
 import io
 import logging
+import threading
 from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import Request as GoogleAuthRequest
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
-from typing import Optional, List, Dict
-from datetime import datetime
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseDownload, HttpRequest
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
+from openpyxl import Workbook, load_workbook
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .download_archive import DownloadArchive, get_archive
+from .sheet_catalog import SheetCatalog
+from .google_api_limiter import GoogleApiLimiter, get_google_api_limiter
+from .sheet_readers import SheetReadRequest, read_sheet, row_hash, sheet_header, watermark_is_fresh
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Collection
+from datetime import datetime, date
 import pandas as pd
 
+# 증분 읽기 시 조회할 마지막 컬럼 (A1 표기법)
+SHEET_LAST_COLUMN = 'ZZ'
+
+
 class GoogleSheetsManager:
     """Google Sheets API 관련 작업을 관리하는 클래스"""
 
-    def __init__(self, spreadsheet_url: Optional[str] = None, credentials_path: Optional[str] = None) -> None:
+    def __init__(self, spreadsheet_url: Optional[str] = None, credentials_path: Optional[str] = None,
+                 credentials: Optional[Credentials] = None, api_limiter: Optional[GoogleApiLimiter] = None) -> None:
         """
         GoogleSheetsManager를 초기화합니다.
         
         Args:
             spreadsheet_url: Google Sheets URL (기본값: 환경변수에서 가져옴)
             credentials_path: 서비스 계정 JSON 파일 경로 (기본값: 환경변수에서 가져옴)
+            credentials: 이미 로드한 인증 정보 (주어지면 서비스 계정 파일을 다시 읽지 않음)
+            api_limiter: API 호출 속도 제한/재시도에 사용할 GoogleApiLimiter (기본값: 프로세스 공유 인스턴스)
         """
         self.logger = logging.getLogger(__name__)
         
@@ -42,21 +60,39 @@ class GoogleSheetsManager:
         # 스프레드시트 ID 추출
         self.spreadsheet_id = self._extract_spreadsheet_id_from_url()
         
-        # 서비스 계정 파일 경로 설정 - 프로젝트 루트 기준으로 변경
-        self.credentials_path = credentials_path or os.getenv('GOOGLE_SERVICE_ACCOUNT_FILE')
-        if not self.credentials_path:
-            self.logger.critical("Google 서비스 계정 파일 경로가 제공되지 않았습니다.")
-            raise ValueError("Google 서비스 계정 파일 경로가 필요합니다.")
-        
-        # 상대 경로인 경우 프로젝트 루트 기준으로 절대 경로로 변환
-        if not os.path.isabs(self.credentials_path):
-            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            self.credentials_path = os.path.join(project_root, self.credentials_path)
-            self.logger.info(f"서비스 계정 파일 경로: {self.credentials_path}")
-        
-        self.creds = self._get_credentials()
-        self.drive_service = build('drive', 'v3', credentials=self.creds)
-        self.sheets_service = build('sheets', 'v4', credentials=self.creds)
+        if credentials is not None:
+            self.credentials_path = credentials_path
+            self.creds = credentials
+        else:
+            # 서비스 계정 파일 경로 설정 - 프로젝트 루트 기준으로 변경
+            self.credentials_path = credentials_path or os.getenv('GOOGLE_SERVICE_ACCOUNT_FILE')
+            if not self.credentials_path:
+                self.logger.critical("Google 서비스 계정 파일 경로가 제공되지 않았습니다.")
+                raise ValueError("Google 서비스 계정 파일 경로가 필요합니다.")
+            
+            # 상대 경로인 경우 프로젝트 루트 기준으로 절대 경로로 변환
+            if not os.path.isabs(self.credentials_path):
+                project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+                self.credentials_path = os.path.join(project_root, self.credentials_path)
+                self.logger.info(f"서비스 계정 파일 경로: {self.credentials_path}")
+            
+            self.creds = self._get_credentials()
+
+        # httplib2 연결은 스레드 간에 공유할 수 없으므로 스레드별 연결로 요청을 실행
+        self._local = threading.local()
+        # 리비전과 날짜가 같으면 재사용하는 시트 카탈로그 ((리비전, 날짜), SheetCatalog)
+        self._catalog = None
+        # get_file_name()이 한 번 조회한 Drive 파일 이름
+        self._file_name = None
+
+        # 쿼터는 서비스 계정 단위로 적용되므로 모든 스프레드시트가 같은 limiter를 공유
+        self.api = api_limiter or get_google_api_limiter()
+
+        # 라이브러리에 포함된 정적 discovery 문서를 사용해 네트워크 조회와 파일 캐시를 생략
+        self.drive_service = build('drive', 'v3', credentials=self.creds, cache_discovery=False,
+                                   static_discovery=True, requestBuilder=self._build_request)
+        self.sheets_service = build('sheets', 'v4', credentials=self.creds, cache_discovery=False,
+                                    static_discovery=True, requestBuilder=self._build_request)
         
     def _get_credentials(self) -> Credentials:
         """서비스 계정 파일을 사용하여 인증 정보를 가져옵니다."""
@@ -70,6 +106,34 @@ class GoogleSheetsManager:
             self.logger.error(f"Google 인증 실패: {e}")
             raise
 
+    def _build_request(self, http, *args, **kwargs) -> HttpRequest:
+        """
+        API 요청을 현재 스레드 전용 인증 연결로 실행하도록 만듭니다.
+        여러 시트를 병렬로 읽을 때도 같은 서비스 객체를 안전하게 공유할 수 있고, 스레드별 연결은 재사용됩니다.
+        """
+        return HttpRequest(self._authorized_http(), *args, **kwargs)
+
+    def _authorized_http(self) -> AuthorizedHttp:
+        """현재 스레드 전용 인증 연결을 반환합니다. (처음 사용할 때 만들고 이후 재사용)"""
+        authorized_http = getattr(self._local, 'http', None)
+        if authorized_http is None:
+            authorized_http = AuthorizedHttp(self.creds, http=httplib2.Http())
+            self._local.http = authorized_http
+        return authorized_http
+
+    def ensure_fresh_credentials(self) -> None:
+        """
+        액세스 토큰이 없거나 만료된 경우에만 인증 정보를 갱신합니다.
+        오래 유지되는 인스턴스를 여러 동기화 주기에서 재사용할 때 주기 시작 시 호출합니다.
+        """
+        if self.creds.valid:
+            return
+        try:
+            self.creds.refresh(GoogleAuthRequest())
+            self.logger.info("Google 인증 토큰을 갱신했습니다.")
+        except Exception as e:
+            self.logger.warning(f"Google 인증 토큰 갱신 실패 (요청 시 다시 시도합니다): {e}")
+
     def _extract_spreadsheet_id_from_url(self) -> str:
         """Google Sheets URL에서 스프레드시트 ID를 추출합니다."""
         match = re.search(r'/spreadsheets/d/([a-zA-Z0-9-_]+)', self.spreadsheet_url)
@@ -78,141 +142,533 @@ class GoogleSheetsManager:
             raise ValueError("유효하지 않은 Google Sheets URL입니다.")
         return match.group(1)
 
+    def _fetch_sheet_properties(self) -> Optional[Dict[str, Any]]:
+        """
+        시트 목록 조회에 필요한 속성만 fields 마스크로 가져옵니다. (셀 데이터/서식 등 전체 메타데이터는 받지 않음)
+
+        :return: spreadsheets.get 응답 또는 실패 시 None
+        """
+        try:
+            return self.api.execute(self.sheets_service.spreadsheets().get(
+                spreadsheetId=self.spreadsheet_id,
+                fields='sheets.properties(sheetId,title,index,gridProperties(rowCount,columnCount))'
+            ), api='sheets', label='spreadsheets.get')
+        except Exception as e:
+            self.logger.error(f"시트 목록 가져오기 실패: {e}")
+            return None
+
+    def get_sheet_catalog(self, file_revision: Optional[str] = None, state_store=None) -> Optional[SheetCatalog]:
+        """
+        시트 카탈로그(시트 이름, gid, 행 수, 이름에서 파싱한 날짜)를 가져옵니다.
+        스프레드시트 리비전이 바뀌지 않았으면 메모리 또는 상태 저장소에 캐시된 목록을 API 호출 없이 재사용합니다.
+
+        :param file_revision: get_file_revision()으로 가져온 현재 리비전 (없으면 항상 새로 조회)
+        :param state_store: 시트 목록을 주기 간에 보관할 SyncStateStore (선택)
+        :return: SheetCatalog 또는 실패 시 None
+        """
+        today = date.today()
+        if file_revision and self._catalog and self._catalog[0] == (file_revision, today):
+            return self._catalog[1]
+
+        sheets = None
+        if file_revision and state_store is not None:
+            stored = state_store.get('spreadsheets', self.spreadsheet_id, 'catalog')
+            if stored and stored.get('revision') == file_revision:
+                sheets = stored.get('sheets')
+                self.logger.info("스프레드시트가 변경되지 않아 캐시된 시트 목록을 사용합니다.")
+
+        if sheets is None:
+            spreadsheet = self._fetch_sheet_properties()
+            if spreadsheet is None:
+                return None
+            catalog = SheetCatalog.from_api_response(spreadsheet, today)
+            if file_revision and state_store is not None:
+                state_store.set('spreadsheets', self.spreadsheet_id, 'catalog',
+                                value={'revision': file_revision, 'sheets': catalog.sheets})
+        else:
+            catalog = SheetCatalog(sheets, today)
+
+        self.logger.info(f"스프레드시트에서 {len(catalog.sheets)}개의 시트를 찾았습니다: {catalog.titles}")
+        self._catalog = ((file_revision, today), catalog)
+        return catalog
+
     def get_sheet_names(self) -> List[str]:
         """
         스프레드시트의 모든 시트 이름을 가져옵니다.
         
         :return: 시트 이름 리스트 (순서대로)
         """
-        import time
-        max_retries = 3
-        retry_count = 0
-        
-        while retry_count < max_retries:
+        catalog = self.get_sheet_catalog()
+        return catalog.titles if catalog else []
+
+    def get_file_revision(self) -> Optional[str]:
+        """
+        Drive 메타데이터에서 스프레드시트의 현재 리비전 정보를 가져옵니다.
+        시트 내용이 바뀌면 modifiedTime과 version이 함께 갱신되므로 이를 리비전 키로 사용합니다.
+
+        :return: 'modifiedTime|version' 형태의 리비전 문자열 또는 실패 시 None
+        """
+        try:
+            file_info = self.api.execute(self.drive_service.files().get(
+                fileId=self.spreadsheet_id,
+                fields='modifiedTime,version'
+            ), api='drive', label='files.get')
+            return f"{file_info.get('modifiedTime', '')}|{file_info.get('version', '')}"
+        except Exception as e:
+            self.logger.warning(f"스프레드시트 리비전 조회 실패: {e}")
+            return None
+
+    def has_changed_since_last_sync(self, state_store, revision: Optional[str]) -> bool:
+        """
+        현재 리비전을 마지막으로 동기화한 리비전과 비교합니다.
+        리비전을 알 수 없는 경우에는 안전하게 변경된 것으로 간주합니다.
+
+        :param state_store: SyncStateStore 인스턴스
+        :param revision: get_file_revision()으로 가져온 현재 리비전
+        :return: 변경 여부 (True/False)
+        """
+        if not revision:
+            return True
+        last_revision = state_store.get('spreadsheets', self.spreadsheet_id, 'revision')
+        return revision != last_revision
+
+    def mark_synced(self, state_store, revision: Optional[str]) -> None:
+        """
+        동기화를 마친 리비전을 상태 저장소에 기록합니다.
+
+        :param state_store: SyncStateStore 인스턴스
+        :param revision: 동기화를 완료한 리비전
+        """
+        if not revision:
+            return
+        state_store.set('spreadsheets', self.spreadsheet_id, 'revision', value=revision)
+        state_store.save()
+
+    @staticmethod
+    def _quote_sheet_name(sheet_name: str) -> str:
+        """A1 표기법에서 사용할 수 있도록 시트 이름을 작은따옴표로 감쌉니다."""
+        return "'" + sheet_name.replace("'", "''") + "'"
+
+    def _batch_get_values(self, ranges: List[str]) -> Optional[List[List[List[Any]]]]:
+        """
+        spreadsheets.values.batchGet으로 여러 범위의 셀 값을 한 번에 가져옵니다.
+
+        :param ranges: A1 표기법 범위 리스트
+        :return: 범위 순서대로의 행 리스트 또는 실패 시 None
+        """
+        try:
+            response = self.api.execute(self.sheets_service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=ranges,
+                majorDimension='ROWS',
+                valueRenderOption='FORMATTED_VALUE'
+            ), api='sheets', label='values.batchGet')
+            return [value_range.get('values', []) for value_range in response.get('valueRanges', [])]
+        except Exception as e:
+            self.logger.error(f"시트 값 가져오기 실패 ({ranges}): {e}")
+            return None
+
+    def count_data_rows(self, sheet_name: str) -> Optional[int]:
+        """
+        첫 열(A:A)만 가져와 값이 있는 마지막 행 번호를 확인합니다.
+        카탈로그의 행 수는 빈 행까지 포함한 그리드 크기이므로 실제 데이터 범위가 필요할 때 사용합니다.
+
+        :param sheet_name: 시트 이름
+        :return: 마지막 데이터 행 번호 (1부터 시작) 또는 실패 시 None
+        """
+        values = self._batch_get_values([f"{self._quote_sheet_name(sheet_name)}!A:A"])
+        return len(values[0]) if values else None
+
+    def get_sheet_values(self, sheet_names: List[str]) -> Dict[str, List[List[Any]]]:
+        """
+        spreadsheets.values.batchGet으로 지정한 시트들의 셀 값만 가져옵니다.
+        엑셀 내보내기 없이 필요한 시트의 값만 받아오므로 전체 다운로드보다 훨씬 가볍습니다.
+
+        :param sheet_names: 값을 가져올 시트 이름 리스트
+        :return: {시트이름: 행 리스트} 형태의 딕셔너리 (실패 시 빈 딕셔너리)
+        """
+        if not sheet_names:
+            return {}
+
+        values = self._batch_get_values([self._quote_sheet_name(name) for name in sheet_names])
+        if values is None:
+            return {}
+        return dict(zip(sheet_names, values))
+
+    @staticmethod
+    def _values_to_dataframe(values: List[List[Any]], header_row: int = 0,
+                             columns: Optional[Collection[str]] = None) -> pd.DataFrame:
+        """
+        Sheets API가 반환한 행 리스트를 DataFrame으로 변환합니다.
+        pd.read_excel과 동일하게 빈 헤더는 'Unnamed: N', 중복 헤더는 '이름.1' 형태로 만듭니다.
+
+        :param values: 행 리스트
+        :param header_row: 헤더로 사용할 행의 위치 (0부터 시작)
+        :param columns: 이 컬럼들만 DataFrame으로 만듦 (없으면 전체 컬럼)
+        :return: 변환된 DataFrame
+        """
+        if len(values) <= header_row:
+            return pd.DataFrame()
+
+        raw_header = values[header_row]
+        rows = values[header_row + 1:]
+        width = max([len(raw_header)] + [len(row) for row in rows])
+        header = sheet_header(raw_header, width)
+
+        # 필요한 컬럼만 선택 (사용하지 않는 컬럼은 행 리스트에서 꺼내지 않음)
+        positions = range(width) if columns is None else [i for i, name in enumerate(header) if name in columns]
+
+        # API는 행 끝의 빈 셀을 생략하므로 없는 셀은 None으로 채우고, 빈 문자열도 None으로 변환
+        records = [
+            [row[i] if i < len(row) and row[i] != '' else None for i in positions]
+            for row in rows
+        ]
+        return pd.DataFrame(records, columns=[header[i] for i in positions])
+
+    def read_sheet_as_dataframe(self, sheet_name: str, header_row: int = 0,
+                                columns: Optional[Collection[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        엑셀 내보내기 없이 Sheets API로 시트 하나를 읽어 DataFrame으로 반환합니다.
+
+        :param sheet_name: 읽을 시트 이름
+        :param header_row: 헤더로 사용할 행의 위치 (0부터 시작, pd.read_excel의 skiprows와 동일)
+        :param columns: 이 컬럼들만 DataFrame으로 만듦 (없으면 전체 컬럼)
+        :return: DataFrame 또는 실패 시 None
+        """
+        values_by_sheet = self.get_sheet_values([sheet_name])
+        if sheet_name not in values_by_sheet:
+            return None
+
+        df = self._values_to_dataframe(values_by_sheet[sheet_name], header_row, columns)
+        self.logger.info(f"Sheets API로 시트 '{sheet_name}'에서 {len(df)}개의 행을 읽었습니다.")
+        return df
+
+    def iter_sheet_rows(self, sheet_name: str, header_row: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Sheets API로 시트를 읽어 행 단위 딕셔너리를 순회합니다.
+
+        :param sheet_name: 읽을 시트 이름
+        :param header_row: 헤더로 사용할 행의 위치 (0부터 시작)
+        :return: {컬럼명: 값} 딕셔너리 이터레이터
+        """
+        df = self.read_sheet_as_dataframe(sheet_name, header_row)
+        if df is None:
+            return iter(())
+        return iter(df.to_dict('records'))
+
+    def read_sheet_incremental(self, sheet_name: str, header_row: int = 0,
+                               watermark: Optional[Dict[str, Any]] = None,
+                               full_rescan_hours: float = 24,
+                               columns: Optional[Collection[str]] = None) -> Tuple[Optional[pd.DataFrame], Optional[Dict[str, Any]]]:
+        """
+        워터마크 이후에 추가된 행만 Sheets API로 읽습니다.
+        워터마크 행(마지막으로 처리한 행)의 해시가 달라졌거나 마지막 전체 스캔 후 full_rescan_hours가 지나면
+        시트 전체를 다시 읽습니다.
+
+        :param sheet_name: 읽을 시트 이름
+        :param header_row: 헤더로 사용할 행의 위치 (0부터 시작)
+        :param watermark: 이전 주기의 워터마크 {'row': 시트 행 번호, 'hash': 행 해시, 'full_scan_at': ISO 시각}
+        :param full_rescan_hours: 전체 스캔 주기 (시간)
+        :param columns: 이 컬럼들만 DataFrame으로 만듦 (없으면 전체 컬럼, 워터마크 해시는 행 전체 기준)
+        :return: (시트 행 번호를 인덱스로 하는 DataFrame, 새 워터마크) 또는 실패 시 (None, None)
+        """
+        quoted = self._quote_sheet_name(sheet_name)
+        header_row_number = header_row + 1  # 시트 행 번호 (1부터 시작)
+
+        if watermark and watermark.get('row', 0) > header_row_number:
+            if watermark_is_fresh(watermark, header_row, full_rescan_hours):
+                anchor_row = watermark['row']
+                values = self._batch_get_values([
+                    f"{quoted}!A{header_row_number}:{SHEET_LAST_COLUMN}{header_row_number}",
+                    f"{quoted}!A{anchor_row}:{SHEET_LAST_COLUMN}{anchor_row}",
+                    f"{quoted}!A{anchor_row + 1}:{SHEET_LAST_COLUMN}",
+                ])
+                if values is None:
+                    return None, None
+
+                header_values, anchor_values, tail_values = values
+                if header_values and anchor_values and row_hash(anchor_values[0]) == watermark.get('hash'):
+                    df = self._values_to_dataframe(header_values + tail_values, 0, columns)
+                    df.index = range(anchor_row + 1, anchor_row + 1 + len(df))
+
+                    new_watermark = dict(watermark)
+                    if tail_values:
+                        new_watermark['row'] = anchor_row + len(tail_values)
+                        new_watermark['hash'] = row_hash(tail_values[-1])
+                    self.logger.info(f"시트 '{sheet_name}'의 {anchor_row + 1}행부터 {len(df)}개의 신규 행을 읽었습니다.")
+                    return df, new_watermark
+
+                self.logger.info(f"시트 '{sheet_name}'의 워터마크 행({anchor_row}행)이 변경되어 전체를 다시 읽습니다.")
+            else:
+                self.logger.info(f"시트 '{sheet_name}'의 전체 스캔 주기가 지나 전체를 다시 읽습니다.")
+
+        values_by_sheet = self.get_sheet_values([sheet_name])
+        if sheet_name not in values_by_sheet:
+            return None, None
+
+        values = values_by_sheet[sheet_name]
+        df = self._values_to_dataframe(values, header_row, columns)
+        first_data_row = header_row_number + 1
+        df.index = range(first_data_row, first_data_row + len(df))
+
+        new_watermark = None
+        if len(values) > header_row_number:
+            new_watermark = {
+                'row': len(values),
+                'hash': row_hash(values[-1]),
+                'full_scan_at': datetime.now().isoformat()
+            }
+        self.logger.info(f"Sheets API로 시트 '{sheet_name}' 전체에서 {len(df)}개의 행을 읽었습니다.")
+        return df, new_watermark
+
+    def read_sheet(self, sheet_name: str, header_row: int = 0, columns: Optional[Collection[str]] = None,
+                   text_columns: Collection[str] = (), reader: Optional[str] = None,
+                   sheet_info: Optional[Dict[str, Any]] = None, watermark: Optional[Dict[str, Any]] = None,
+                   full_rescan_hours: float = 24,
+                   load_workbook=None) -> Tuple[Optional[pd.DataFrame], Optional[Dict[str, Any]], Optional[str]]:
+        """
+        설정된 읽기 방식(api, csv, openpyxl, calamine 또는 auto)으로 시트 하나를 읽습니다.
+        선택된 방식이 실패하면 다음 방식(마지막은 엑셀 내보내기)으로 읽습니다.
+
+        :param sheet_name: 읽을 시트 이름
+        :param header_row: 헤더로 사용할 행의 위치 (0부터 시작)
+        :param columns: 이 컬럼들만 DataFrame으로 만듦 (없으면 전체 컬럼)
+        :param text_columns: 엑셀 방식에서 문자열로 읽을 컬럼
+        :param reader: 읽기 방식 (기본값: 환경변수 SHEETS_INGESTION_MODE 또는 auto)
+        :param sheet_info: 시트 카탈로그의 시트 정보 (CSV 내보내기의 gid, auto 모드의 행 수)
+        :param watermark: 이전 주기의 워터마크 (api 방식에서 신규 행만 읽을 때 사용)
+        :param full_rescan_hours: 전체 스캔 주기 (시간)
+        :param load_workbook: 엑셀 내보내기 내용(bytes)을 반환하는 함수 (없으면 직접 내보냄)
+        :return: (DataFrame, 새 워터마크, 사용한 읽기 방식) 또는 실패 시 (None, None, None)
+        """
+        if sheet_info is None:
+            catalog = self.get_sheet_catalog()
+            sheet_info = catalog.get(sheet_name) if catalog else None
+        request = SheetReadRequest(sheet_name, header_row=header_row, columns=columns, text_columns=text_columns,
+                                   sheet_info=sheet_info, watermark=watermark, full_rescan_hours=full_rescan_hours,
+                                   load_workbook=load_workbook)
+        return read_sheet(self, request, reader)
+
+    def export_sheet_csv(self, sheet_id: int) -> Optional[bytes]:
+        """
+        시트 하나를 CSV로 내보냅니다. (export 엔드포인트, Drive 쿼터로 집계)
+        전체 스프레드시트를 엑셀로 내보내지 않고 필요한 시트만 받으므로 큰 스프레드시트에서도 전송량이 작습니다.
+
+        :param sheet_id: 시트 gid
+        :return: CSV 내용 (UTF-8) 또는 실패 시 None
+        """
+        url = f"https://docs.google.com/spreadsheets/d/{self.spreadsheet_id}/export?format=csv&gid={sheet_id}"
+
+        def fetch():
+            response, content = self._authorized_http().request(url, 'GET')
+            if response.status >= 400:
+                # limiter가 429/5xx를 재시도할 수 있도록 API 오류와 같은 예외로 변환
+                raise HttpError(response, content, uri=url)
+            return content
+
+        try:
+            content = self.api.call(fetch, api='drive', label='export csv')
+            self.logger.info(f"시트(gid={sheet_id})를 CSV로 내보냈습니다 ({len(content):,} bytes).")
+            return content
+        except Exception as e:
+            self.logger.error(f"시트(gid={sheet_id}) CSV 내보내기 실패: {e}")
+            return None
+
+    def get_file_name(self) -> str:
+        """Drive에 저장된 스프레드시트 파일 이름을 가져옵니다. (한 번 조회한 값은 재사용)"""
+        if not self._file_name:
             try:
-                spreadsheet_id = self.spreadsheet_id
-                
-                # 스프레드시트 메타데이터 가져오기
-                spreadsheet = self.sheets_service.spreadsheets().get(
-                    spreadsheetId=spreadsheet_id
-                ).execute()
-                
-                # 시트 이름 추출 (순서대로)
-                sheet_names = []
-                for sheet in spreadsheet['sheets']:
-                    sheet_names.append(sheet['properties']['title'])
-                    
-                self.logger.info(f"스프레드시트에서 {len(sheet_names)}개의 시트를 찾았습니다: {sheet_names}")
-                return sheet_names
-                
+                file_info = self.api.execute(self.drive_service.files().get(fileId=self.spreadsheet_id, fields='name'),
+                                             api='drive', label='files.get')
+                self._file_name = file_info.get('name', 'spreadsheet')
             except Exception as e:
-                retry_count += 1
-                if "503" in str(e) and retry_count < max_retries:
-                    wait_time = 2 ** retry_count  # 지수 백오프: 2, 4, 8초
-                    self.logger.warning(f"Google Sheets API 일시적 오류. {wait_time}초 후 재시도합니다... ({retry_count}/{max_retries})")
-                    time.sleep(wait_time)
-                else:
-                    self.logger.error(f"시트 목록 가져오기 실패: {e}")
-                    return []
-        
-        return []
+                self.logger.warning(f"스프레드시트 이름 조회 실패: {e}")
+                return 'spreadsheet'
+        return self._file_name
 
-    def download_sheet_as_excel(self, output_dir: str = "downloads") -> Optional[str]:
+    def export_workbook(self) -> Optional[io.BytesIO]:
         """
-        Google Drive API를 사용하여 스프레드시트를 엑셀 파일로 다운로드합니다.
+        Google Drive API로 스프레드시트를 엑셀 형식으로 내보내 메모리 버퍼에 담습니다.
+        디스크에 쓰지 않으므로 반환된 버퍼를 그대로 pd.ExcelFile 등에 넘겨 파싱할 수 있습니다.
 
-        :param output_dir: 다운로드할 디렉토리
-        :return: 다운로드된 파일의 경로 또는 실패 시 None
+        :return: 처음 위치로 되감긴 BytesIO 버퍼 또는 실패 시 None
         """
         try:
-            spreadsheet_id = self.spreadsheet_id
-            self.logger.info(f"스프레드시트 다운로드를 시작합니다 (ID: {spreadsheet_id}).")
+            self.logger.info(f"스프레드시트 내보내기를 시작합니다 (ID: {self.spreadsheet_id}).")
 
             request = self.drive_service.files().export_media(
-                fileId=spreadsheet_id,
+                fileId=self.spreadsheet_id,
                 mimeType='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
             )
-            
-            # 날짜별 폴더 생성
-            date_folder = datetime.now().strftime("%Y-%m-%d")
-            full_output_dir = os.path.join(output_dir, date_folder)
-            os.makedirs(full_output_dir, exist_ok=True)
-            
-            file_info = self.drive_service.files().get(fileId=spreadsheet_id, fields='name').execute()
-            sheet_name = file_info.get('name', 'spreadsheet')
-            safe_sheet_name = "".join(c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            
-            timestamp = datetime.now().strftime("%H%M%S")
-            filename = f"{safe_sheet_name}_{timestamp}.xlsx"
-            filepath = os.path.join(full_output_dir, filename)
 
-            fh = io.FileIO(filepath, 'wb')
-            downloader = MediaIoBaseDownload(fh, request)
-            
+            buffer = io.BytesIO()
+            downloader = MediaIoBaseDownload(buffer, request)
+
             done = False
             while not done:
-                status, done = downloader.next_chunk()
+                status, done = self.api.call(downloader.next_chunk, api='drive', label='files.export')
                 self.logger.info(f"다운로드 진행률: {int(status.progress() * 100)}%")
 
+            buffer.seek(0)
+            self.logger.info(f"✅ 스프레드시트를 메모리로 내보냈습니다 ({buffer.getbuffer().nbytes:,} bytes).")
+            return buffer
+
+        except Exception as e:
+            self.logger.error(f"스프레드시트 내보내기 실패: {e}")
+            return None
+
+    def get_archive(self, output_dir: str = "downloads") -> DownloadArchive:
+        """보관 디렉토리의 DownloadArchive 인스턴스를 반환합니다. (모든 스프레드시트가 공유)"""
+        return get_archive(output_dir)
+
+    def archive_workbook(self, workbook: io.BytesIO, output_dir: str = "downloads") -> Optional[str]:
+        """
+        메모리로 내보낸 엑셀 버퍼를 내용 해시 기반 보관소에 저장합니다.
+        직전 스냅샷과 내용이 같으면 새 파일을 쓰지 않습니다.
+
+        :param workbook: export_workbook()이 반환한 버퍼
+        :param output_dir: 보관할 디렉토리
+        :return: 보관된 blob 경로 또는 실패 시 None
+        """
+        return self.get_archive(output_dir).store(bytes(workbook.getbuffer()), self.get_file_name(), kind='workbook')
+
+    @staticmethod
+    def _write_download(directory: str, name: str, data: bytes) -> str:
+        """
+        엑셀 파일 내용을 '{이름}_{시각}.xlsx'로 저장합니다. (임시 파일에 쓴 뒤 교체하므로 쓰다 만 파일이 남지 않음)
+
+        :param directory: 저장할 디렉토리
+        :param name: 파일 이름에 사용할 스프레드시트 또는 시트 이름
+        :param data: 엑셀 파일 내용
+        :return: 저장된 파일 경로
+        """
+        os.makedirs(directory, exist_ok=True)
+        safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        filepath = os.path.join(directory, f"{safe_name}_{datetime.now().strftime('%H%M%S')}.xlsx")
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, filepath)
+        return filepath
+
+    def download_sheet_as_excel(self, output_dir: str = "downloads") -> Optional[str]:
+        """
+        Google Drive API를 사용하여 스프레드시트를 엑셀 파일로 다운로드합니다.
+        (보관소에는 저장하지 않음, 동기화 중 보관은 archive_workbook() 사용)
+
+        :param output_dir: 다운로드할 디렉토리 (날짜별 폴더에 저장)
+        :return: 다운로드된 .xlsx 파일의 경로 또는 실패 시 None
+        """
+        workbook = self.export_workbook()
+        if workbook is None:
+            return None
+        try:
+            filepath = self._write_download(os.path.join(output_dir, datetime.now().strftime("%Y-%m-%d")),
+                                            self.get_file_name(), bytes(workbook.getbuffer()))
             self.logger.info(f"✅ 파일이 성공적으로 다운로드되었습니다: {filepath}")
             return filepath
-
         except Exception as e:
             self.logger.error(f"스프레드시트 다운로드 실패: {e}")
             return None
-    
-    def download_all_sheets_separately(self, output_dir: str = "downloads") -> Dict[str, str]:
+
+    def _split_sheets(self, workbook: io.BytesIO, max_workers: Optional[int] = None) -> Iterator[Tuple[str, bytes]]:
         """
-        스프레드시트의 각 시트를 개별 엑셀 파일로 다운로드합니다.
-        
-        :param output_dir: 다운로드할 디렉토리
-        :return: {시트이름: 파일경로} 형태의 딕셔너리
+        워크북의 각 시트를 개별 엑셀 파일 내용으로 만들어 완성되는 순서대로 반환합니다.
+        전체 워크북은 openpyxl read_only 모드로 한 번만 순회하고, 시트별 파일 생성은 병렬로 처리합니다.
+
+        :param workbook: export_workbook()이 반환한 버퍼
+        :param max_workers: 시트 파일 쓰기 작업자 수 (기본값: 환경변수 SPLIT_WORKERS 또는 4)
+        :return: (시트 이름, 엑셀 파일 내용) 이터레이터 (파일을 만들지 못한 시트는 로그만 남기고 건너뜀)
+        """
+        workbook.seek(0)
+        max_workers = max_workers or int(os.getenv('SPLIT_WORKERS', '4'))
+        source = load_workbook(workbook, read_only=True, data_only=True)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {}
+                # 워크북을 한 번만 순회하며 시트별 값을 모아 쓰기 작업으로 넘김
+                for worksheet in source.worksheets:
+                    rows = list(worksheet.iter_rows(values_only=True))
+                    futures[executor.submit(self._build_sheet_file, worksheet.title, rows)] = worksheet.title
+
+                for future in as_completed(futures):
+                    sheet_name = futures[future]
+                    try:
+                        yield sheet_name, future.result()
+                    except Exception as e:
+                        self.logger.error(f"시트 '{sheet_name}' 파일 생성 실패: {e}")
+        finally:
+            source.close()
+
+    def download_all_sheets_separately(self, output_dir: str = "downloads",
+                                       max_workers: Optional[int] = None) -> Dict[str, str]:
+        """
+        스프레드시트의 각 시트를 개별 엑셀 파일로 다운로드합니다. (전체 파일도 함께 저장)
+
+        :param output_dir: 다운로드할 디렉토리 (날짜별 폴더의 sheets 폴더에 저장)
+        :param max_workers: 시트 파일 쓰기 작업자 수 (기본값: 환경변수 SPLIT_WORKERS 또는 4)
+        :return: {시트이름: .xlsx 파일경로} 형태의 딕셔너리
         """
         downloaded_files = {}
-        
+
         try:
-            # 먼저 전체 스프레드시트를 다운로드
-            full_excel_path = self.download_sheet_as_excel(output_dir)
-            if not full_excel_path:
+            workbook = self.export_workbook()
+            if workbook is None:
                 return downloaded_files
-                
-            # 날짜별 폴더 경로
-            date_folder = datetime.now().strftime("%Y-%m-%d")
-            full_output_dir = os.path.join(output_dir, date_folder, "sheets")
-            os.makedirs(full_output_dir, exist_ok=True)
-            
-            # 엑셀 파일 읽기
-            xl_file = pd.ExcelFile(full_excel_path)
-            sheet_names = xl_file.sheet_names
-            
-            # 각 시트를 개별 파일로 저장
-            for sheet_name in sheet_names:
+            date_dir = os.path.join(output_dir, datetime.now().strftime("%Y-%m-%d"))
+            self._write_download(date_dir, self.get_file_name(), bytes(workbook.getbuffer()))
+
+            for sheet_name, data in self._split_sheets(workbook, max_workers):
                 try:
-                    # 시트 데이터 읽기
-                    df = pd.read_excel(full_excel_path, sheet_name=sheet_name)
-                    
-                    # 안전한 파일명 생성
-                    safe_sheet_name = "".join(c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                    timestamp = datetime.now().strftime("%H%M%S")
-                    filename = f"{safe_sheet_name}_{timestamp}.xlsx"
-                    filepath = os.path.join(full_output_dir, filename)
-                    
-                    # 개별 엑셀 파일로 저장
-                    with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
-                    
+                    filepath = self._write_download(os.path.join(date_dir, "sheets"), sheet_name, data)
                     downloaded_files[sheet_name] = filepath
                     self.logger.info(f"시트 '{sheet_name}'을 개별 파일로 저장했습니다: {filepath}")
-                    
                 except Exception as e:
                     self.logger.error(f"시트 '{sheet_name}' 저장 실패: {e}")
-                    
             return downloaded_files
-            
+
         except Exception as e:
             self.logger.error(f"시트 개별 다운로드 실패: {e}")
             return downloaded_files
 
+    def archive_all_sheets(self, workbook: io.BytesIO, output_dir: str = "downloads",
+                           max_workers: Optional[int] = None) -> Dict[str, str]:
+        """
+        메모리로 내보낸 엑셀 버퍼의 각 시트를 개별 엑셀 파일로 만들어 내용 해시 기반 보관소에 저장합니다.
+
+        :param workbook: export_workbook()이 반환한 버퍼
+        :param output_dir: 보관할 디렉토리
+        :param max_workers: 시트 파일 쓰기 작업자 수 (기본값: 환경변수 SPLIT_WORKERS 또는 4)
+        :return: {시트이름: 보관된 blob 경로} 형태의 딕셔너리
+        """
+        archived = {}
+        try:
+            archive = self.get_archive(output_dir)
+            for sheet_name, data in self._split_sheets(workbook, max_workers):
+                blob_path = archive.store(data, sheet_name, kind='sheet')
+                if blob_path:
+                    archived[sheet_name] = blob_path
+        except Exception as e:
+            self.logger.error(f"시트 개별 보관 실패: {e}")
+        return archived
+
+    @staticmethod
+    def _build_sheet_file(sheet_name: str, rows: List[tuple]) -> bytes:
+        """
+        시트 하나의 값을 write_only 워크북으로 만들어 엑셀 파일 내용을 반환합니다.
+
+        :param sheet_name: 시트 이름
+        :param rows: 셀 값 튜플의 리스트
+        :return: 엑셀 파일 내용
+        """
+        target = Workbook(write_only=True)
+        worksheet = target.create_sheet(title=sheet_name)
+        for row in rows:
+            worksheet.append(row)
+        buffer = io.BytesIO()
+        target.save(buffer)
+        return buffer.getvalue()
+
 
 def main():
     """메인 함수"""
@@ -253,10 +709,10 @@ def main():
             manager.download_sheet_as_excel(args.output)
             
         elif args.action == 'download-all':
-            sheet_list = manager.get_sheet_names()
-            for sheet in sheet_list:
-                print(f"\n📥 다운로드 중: {sheet}")
-                manager.download_all_sheets_separately(args.output)
+            print("\n📥 모든 시트를 다운로드하는 중...")
+            downloaded_files = manager.download_all_sheets_separately(args.output)
+            for sheet, filepath in downloaded_files.items():
+                print(f"  {sheet}: {filepath}")
             
     except Exception as e:
         print(f"❌ 프로그램 실행 중 오류: {e}")
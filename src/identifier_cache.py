@@ -0,0 +1,170 @@
+import os
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .identity import (IdentifierIndex, exact_index_enabled, hash_identities, hash_scheme,
+                       normalize_name_series, normalize_phone_series)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS identifiers (
+    view TEXT NOT NULL,
+    name TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    hash INTEGER NOT NULL,
+    PRIMARY KEY (view, name, phone)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sync_meta (
+    view TEXT PRIMARY KEY,
+    high_water INTEGER,
+    full_sync_at TEXT,
+    hash_scheme TEXT
+);
+"""
+
+
+class IdentifierCache:
+    """
+    inquiry_type(또는 뷰)별 기존 식별자(정규화된 이름/연락처와 64비트 해시)를 로컬 SQLite 파일에 보관하는 캐시
+
+    매 주기 뷰 전체를 내려받는 대신 high-water mark(마지막으로 가져온 id) 이후의 행만 가져와 추가하고,
+    full_sync_hours마다 전체를 다시 가져와 교체합니다. (삭제/수정된 행 반영)
+    직접 삽입한 레코드도 바로 추가하므로 다음 주기에 다시 내려받기 전에도 캐시가 최신 상태입니다.
+    해시 방식(pandas 버전 등)이 저장할 때와 달라지면 전체를 다시 가져와 해시를 새로 만듭니다.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, full_sync_hours: Optional[float] = None):
+        """
+        IdentifierCache를 초기화합니다.
+
+        :param cache_path: 캐시 파일 경로 (기본값: 환경변수 IDENTIFIER_CACHE_FILE 또는 프로젝트 루트의 state/identifier_cache.sqlite3)
+        :param full_sync_hours: 전체 재조회 주기 (시간, 기본값: 환경변수 IDENTIFIER_CACHE_FULL_SYNC_HOURS 또는 24)
+        """
+        self.logger = logging.getLogger(__name__)
+
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.cache_path = cache_path or os.getenv('IDENTIFIER_CACHE_FILE') or os.path.join(project_root, 'state', 'identifier_cache.sqlite3')
+        if not os.path.isabs(self.cache_path):
+            self.cache_path = os.path.join(project_root, self.cache_path)
+        self.full_sync_hours = full_sync_hours if full_sync_hours is not None else float(
+            os.getenv('IDENTIFIER_CACHE_FULL_SYNC_HOURS', '24'))
+
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        self._lock = threading.Lock()
+        # 여러 작업자 스레드가 같은 연결을 쓰므로 모든 접근은 _lock으로 직렬화
+        self._conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        # 해시 방식 컬럼이 없던 캐시 파일은 컬럼을 추가 (기록이 없으므로 다음 조회에서 전체를 다시 가져옴)
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(sync_meta)')}
+        if 'hash_scheme' not in columns:
+            self._conn.execute('ALTER TABLE sync_meta ADD COLUMN hash_scheme TEXT')
+        self.hash_scheme = hash_scheme()
+
+    @staticmethod
+    def _prepare(names: Iterable[Any], phones: Iterable[Any]) -> Tuple[pd.Series, pd.Series, np.ndarray]:
+        """이름/연락처를 정규화하고 빈 항목을 제외한 뒤 해시를 계산합니다. (SQLite 정수에 맞게 int64로 변환)"""
+        names = normalize_name_series(pd.Series(list(names), dtype=object))
+        phones = normalize_phone_series(pd.Series(list(phones), dtype=object))
+        valid = ((names != '') & (phones != '')).to_numpy()
+        names, phones = names[valid], phones[valid]
+        return names, phones, hash_identities(names, phones).view(np.int64)
+
+    def high_water(self, view_name: str) -> Optional[int]:
+        """뷰에서 마지막으로 가져온 행의 id를 반환합니다. (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute('SELECT high_water FROM sync_meta WHERE view = ?', (view_name,)).fetchone()
+        return row[0] if row else None
+
+    def needs_full_sync(self, view_name: str) -> bool:
+        """
+        전체를 다시 가져와야 하는지 확인합니다.
+        (한 번도 가져오지 않았거나, 저장된 해시의 방식이 현재와 다르거나, 전체 재조회 주기가 지났을 때)
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT high_water, full_sync_at, hash_scheme FROM sync_meta WHERE view = ?',
+                                     (view_name,)).fetchone()
+        if not row or row[0] is None or not row[1]:
+            return True
+        if row[2] != self.hash_scheme:
+            self.logger.info(f"'{view_name}' 캐시의 해시 방식이 현재와 달라 전체를 다시 가져옵니다. ({row[2]} -> {self.hash_scheme})")
+            return True
+        return datetime.now() - datetime.fromisoformat(row[1]) >= timedelta(hours=self.full_sync_hours)
+
+    def add(self, view_name: str, names: Iterable[Any], phones: Iterable[Any]) -> int:
+        """
+        식별자를 캐시에 추가합니다. (가져온 행 한 페이지 또는 직접 삽입한 레코드)
+
+        :return: 새로 추가된 식별자 수
+        """
+        # 정규화/해시는 잠금 밖에서 계산 (여러 스레드가 페이지를 동시에 추가할 수 있음)
+        names, phones, hashes = self._prepare(names, phones)
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            # 이미 있는 식별자는 무시
+            self._conn.executemany('INSERT OR IGNORE INTO identifiers (view, name, phone, hash) VALUES (?, ?, ?, ?)',
+                                   zip([view_name] * len(names), names, phones, hashes.tolist()))
+            return self._conn.total_changes - before
+
+    def mark_full_sync(self, view_name: str, high_water: Optional[int]) -> None:
+        """
+        뷰 전체를 다시 가져왔음을 기록합니다. clear() 후 모든 페이지를 add()한 다음 호출합니다.
+        (중간에 실패하면 기록이 없으므로 다음 조회에서 다시 전체를 가져옴)
+
+        :param high_water: 가져온 행 중 가장 큰 id (행이 없으면 None)
+        """
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO sync_meta (view, high_water, full_sync_at, hash_scheme) '
+                               'VALUES (?, ?, ?, ?)',
+                               (view_name, high_water or 0, datetime.now().isoformat(), self.hash_scheme))
+
+    def advance_high_water(self, view_name: str, high_water: int) -> None:
+        """high-water mark 이후의 행을 모두 추가한 뒤 high-water mark를 옮깁니다."""
+        with self._lock, self._conn:
+            self._conn.execute('UPDATE sync_meta SET high_water = MAX(COALESCE(high_water, 0), ?) WHERE view = ?',
+                               (high_water, view_name))
+
+    def load(self, view_name: str, exact: Optional[bool] = None) -> IdentifierIndex:
+        """
+        캐시된 식별자로 조회용 색인을 만듭니다. (정규화/해시는 저장할 때 한 번만 계산)
+
+        :param exact: 키까지 비교할지 여부 (기본값: 환경변수 IDENTIFIER_INDEX_EXACT 또는 False)
+        :return: IdentifierIndex
+        """
+        exact = exact if exact is not None else exact_index_enabled()
+        with self._lock:
+            if exact:
+                rows = self._conn.execute('SELECT name, phone FROM identifiers WHERE view = ?', (view_name,)).fetchall()
+                return IdentifierIndex.from_normalized(pd.Series([row[0] for row in rows], dtype=object),
+                                                       pd.Series([row[1] for row in rows], dtype=object), exact=True)
+            cursor = self._conn.execute('SELECT hash FROM identifiers WHERE view = ?', (view_name,))
+            hashes = np.fromiter((row[0] for row in cursor), dtype=np.int64)
+        return IdentifierIndex(hashes.view(np.uint64))
+
+    def views(self, prefix: str = '') -> List[str]:
+        """prefix로 시작하는 캐시 키(뷰 또는 '테이블:inquiry_type') 목록을 반환합니다."""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT view FROM identifiers WHERE substr(view, 1, ?) = ?",
+                                      (len(prefix), prefix)).fetchall()
+        return [row[0] for row in rows]
+
+    def clear(self, view_name: Optional[str] = None) -> None:
+        """캐시를 비웁니다. (view_name이 없으면 전체, 다음 조회 시 전체를 다시 가져옴)"""
+        with self._lock, self._conn:
+            if view_name is None:
+                self._conn.execute('DELETE FROM identifiers')
+                self._conn.execute('DELETE FROM sync_meta')
+            else:
+                self._conn.execute('DELETE FROM identifiers WHERE view = ?', (view_name,))
+                self._conn.execute('DELETE FROM sync_meta WHERE view = ?', (view_name,))
+
+    def close(self) -> None:
+        """캐시 파일 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,273 @@
+import os
+import re
+import threading
+import unicodedata
+from typing import Any, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 한국 국가번호 (+82)
+_COUNTRY_CODE = '82'
+_FLOAT_SUFFIX = re.compile(r'\.0+$')
+# ASCII 숫자만 남김 (\D는 유니코드 숫자를 남기므로 사용하지 않음)
+_NON_DIGITS = re.compile(r'[^0-9]')
+# 맨 앞 0이 빠진 국내 번호를 알아보는 (앞자리, 0을 뺀 자릿수 범위)
+# 휴대폰 01x, 서울 02, 지역번호 031~064, 인터넷전화 070 (1588 등 8자리 대표번호는 0을 붙이지 않음)
+_AREA_CODES = ('31', '32', '33', '41', '42', '43', '44', '51', '52', '53', '54', '55', '61', '62', '63', '64')
+_DROPPED_ZERO_PREFIXES = (
+    (('1',), 9, 10),
+    (('2',), 8, 9),
+    (_AREA_CODES, 9, 10),
+    (('70',), 9, 10),
+)
+
+# exact 모드에서 키를 만들 때 이름과 연락처 사이에 넣는 구분자 (이름/연락처에 나오지 않는 제어 문자)
+_KEY_SEPARATOR = '\x1f'
+
+# 정규화 규칙이나 해시 계산 방식을 바꾸면 올려서 저장된 해시를 다시 만들게 함
+_HASH_SCHEME_VERSION = 3
+
+
+def normalize_phone(phone: Any) -> str:
+    """
+    연락처를 국내 표기의 숫자 문자열(예: 01012345678)로 정규화합니다.
+
+    - 전각 숫자 등은 NFKC 정규화로 ASCII 숫자로 변환한 뒤 하이픈, 공백, 괄호 등 숫자가 아닌 문자 제거
+    - 숫자 셀이 실수로 읽혀 붙은 '.0' 제거 (1012345678.0)
+    - 국가번호 +82 / 82 를 0으로 변환 (+82 10-1234-5678, +82 010-1234-5678, +82 2-123-4567)
+    - 숫자 셀로 읽혀 잃어버린 맨 앞 0 복원 (1012345678 -> 01012345678, 212345678 -> 0212345678,
+      3112345678 -> 03112345678, 7012345678 -> 07012345678)
+
+    :param phone: 연락처 값 (null이면 빈 문자열 반환)
+    :return: 정규화된 연락처
+    """
+    if phone is None or (isinstance(phone, float) and phone != phone):
+        return ''
+    text = str(phone)
+    # 이미 정규화된 값(DB에 저장된 값 대부분)은 그대로 반환
+    if text[:1] == '0' and text.isascii() and text.isdigit():
+        return text
+
+    # 흔한 표기(하이픈/공백 구분)는 정규식 없이 처리
+    digits = text.replace('-', '').replace(' ', '')
+    if not (digits.isascii() and digits.isdigit()):
+        digits = _NON_DIGITS.sub('', _FLOAT_SUFFIX.sub('', unicodedata.normalize('NFKC', text).strip()))
+
+    # 국가번호 제거 후 0으로 시작하는 국내 표기로 변환
+    # (앞의 0이 빠진 국내 번호는 82로 시작하지 않으므로 서울 7자리 가입자 번호(82 2-123-4567, 10자리)까지 포함)
+    if digits.startswith(_COUNTRY_CODE) and 10 <= len(digits) <= 13:
+        digits = '0' + digits[len(_COUNTRY_CODE):].lstrip('0')
+
+    # 맨 앞 0이 빠진 번호: 휴대폰, 서울, 지역번호, 인터넷전화 (_DROPPED_ZERO_PREFIXES)
+    if digits[:1] != '0':
+        for prefixes, min_length, max_length in _DROPPED_ZERO_PREFIXES:
+            if min_length <= len(digits) <= max_length and digits.startswith(prefixes):
+                return '0' + digits
+    return digits
+
+
+def normalize_name(name: Any) -> str:
+    """
+    이름을 정규화합니다. (유니코드 NFC 정규화, 앞뒤 공백 제거, 연속 공백은 한 칸으로)
+
+    :param name: 이름 값 (null이면 빈 문자열 반환)
+    :return: 정규화된 이름
+    """
+    if name is None or (isinstance(name, float) and name != name):
+        return ''
+    return ' '.join(unicodedata.normalize('NFC', str(name)).split())
+
+
+def normalize_phone_series(phones: pd.Series) -> pd.Series:
+    """
+    연락처 컬럼 전체를 normalize_phone 규칙으로 정규화합니다.
+    (object 컬럼의 .str 연산도 값마다 Python 루프를 돌기 때문에, 여러 번의 .str 연산 대신 값마다 한 번만 처리)
+    """
+    return pd.Series([normalize_phone(phone) for phone in phones], index=phones.index, dtype=object)
+
+
+def normalize_name_series(names: pd.Series) -> pd.Series:
+    """이름 컬럼 전체를 normalize_name 규칙으로 정규화합니다."""
+    return pd.Series([normalize_name(name) for name in names], index=names.index, dtype=object)
+
+
+def hash_identities(names: pd.Series, phones: pd.Series) -> np.ndarray:
+    """
+    정규화된 (이름, 연락처) 컬럼을 행별 64비트 해시 배열로 만듭니다.
+
+    :return: uint64 해시 배열
+    """
+    frame = pd.DataFrame({'name': names.to_numpy(dtype=object), 'phone': phones.to_numpy(dtype=object)})
+    return pd.util.hash_pandas_object(frame, index=False, categorize=False).to_numpy()
+
+
+def hash_scheme() -> str:
+    """
+    현재 환경의 식별자 해시 방식을 나타내는 문자열을 반환합니다.
+    pandas는 hash_pandas_object 값이 버전 간에 같다고 보장하지 않으므로, 고정된 표본의 해시를 함께 담아
+    저장해 둔 해시(로컬 식별자 캐시)를 그대로 쓸 수 있는지 판단하는 데 사용합니다.
+    """
+    probe = hash_identities(pd.Series(['홍길동'], dtype=object), pd.Series(['01012345678'], dtype=object))
+    return f"{_HASH_SCHEME_VERSION}:{int(probe[0]):016x}"
+
+
+def exact_index_enabled() -> bool:
+    """환경변수 IDENTIFIER_INDEX_EXACT로 exact 모드(해시가 같을 때 키까지 비교)가 켜져 있는지 확인합니다."""
+    return os.getenv('IDENTIFIER_INDEX_EXACT', 'false').lower() == 'true'
+
+
+def _identity_keys(names: pd.Series, phones: pd.Series) -> np.ndarray:
+    """exact 모드에서 비교할 '이름<구분자>연락처' 키 배열을 만듭니다."""
+    return np.array([f"{name}{_KEY_SEPARATOR}{phone}" for name, phone in zip(names, phones)], dtype=object)
+
+
+class IdentifierIndex:
+    """
+    기존 데이터의 (이름, 연락처) 식별자를 64비트 해시의 정렬된 NumPy 배열로 보관하는 조회용 색인
+
+    튜플 집합 대신 항목당 8바이트만 사용하고, 후보 배치 전체를 np.searchsorted로 한 번에 조회합니다.
+    exact=True이면 원래 키도 함께 보관해 해시가 같을 때 키까지 비교합니다. (해시 충돌 대비, 메모리 추가 사용)
+    """
+
+    def __init__(self, hashes: Optional[np.ndarray] = None, keys: Optional[np.ndarray] = None):
+        """
+        IdentifierIndex를 초기화합니다. 보통은 from_identities()로 만듭니다.
+
+        :param hashes: hash_identities()로 만든 uint64 해시 배열
+        :param keys: 해시와 같은 순서의 키 배열 (주어지면 조회 시 키까지 비교)
+        """
+        hashes = np.asarray(hashes if hashes is not None else [], dtype=np.uint64)
+        order = np.argsort(hashes, kind='stable')
+        hashes = hashes[order]
+        if keys is None:
+            # 정렬 후 중복 해시 제거
+            unique = np.empty(len(hashes), dtype=bool)
+            unique[:1] = True
+            np.not_equal(hashes[1:], hashes[:-1], out=unique[1:])
+            self._hashes = hashes[unique]
+            self._keys = None
+        else:
+            self._hashes = hashes
+            self._keys = np.asarray(keys, dtype=object)[order]
+
+    @classmethod
+    def from_identities(cls, names: Iterable[Any], phones: Iterable[Any], exact: Optional[bool] = None) -> 'IdentifierIndex':
+        """
+        이름/연락처 목록을 정규화해 색인을 만듭니다. DB에서 가져온 기존 데이터에 시트 데이터와 같은 규칙을 적용할 때 사용합니다.
+        이름이나 연락처가 비어 있는 항목은 제외합니다.
+
+        :param exact: 키까지 비교할지 여부 (기본값: 환경변수 IDENTIFIER_INDEX_EXACT 또는 False)
+        :return: IdentifierIndex
+        """
+        names = pd.Series([normalize_name(name) for name in names], dtype=object)
+        phones = pd.Series([normalize_phone(phone) for phone in phones], dtype=object)
+        valid = ((names != '') & (phones != '')).to_numpy()
+        return cls.from_normalized(names[valid], phones[valid], exact)
+
+    @classmethod
+    def from_normalized(cls, names: pd.Series, phones: pd.Series, exact: Optional[bool] = None) -> 'IdentifierIndex':
+        """
+        이미 정규화된 이름/연락처로 색인을 만듭니다. (로컬 캐시에 정규화해 저장한 식별자를 불러올 때 사용)
+
+        :param exact: 키까지 비교할지 여부 (기본값: 환경변수 IDENTIFIER_INDEX_EXACT 또는 False)
+        :return: IdentifierIndex
+        """
+        exact = exact if exact is not None else exact_index_enabled()
+        return cls(hash_identities(names, phones), _identity_keys(names, phones) if exact else None)
+
+    @property
+    def exact(self) -> bool:
+        """해시가 같을 때 키까지 비교하는지 여부"""
+        return self._keys is not None
+
+    @property
+    def nbytes(self) -> int:
+        """해시 배열이 차지하는 메모리 (바이트, exact 모드의 키 문자열 제외)"""
+        return self._hashes.nbytes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def contains(self, names: pd.Series, phones: pd.Series) -> np.ndarray:
+        """
+        정규화된 (이름, 연락처) 배치가 색인에 있는지 한 번에 조회합니다.
+
+        :param names: 정규화된 이름 Series
+        :param phones: 정규화된 연락처 Series (names와 같은 길이)
+        :return: 행별 존재 여부 bool 배열
+        """
+        if not len(self._hashes) or not len(names):
+            return np.zeros(len(names), dtype=bool)
+
+        hashes = hash_identities(names, phones)
+        positions = np.searchsorted(self._hashes, hashes)
+        found = self._hashes[np.minimum(positions, len(self._hashes) - 1)] == hashes
+        if self._keys is None or not found.any():
+            return found
+
+        # exact 모드: 해시가 같은 항목 중 키가 일치하는 것이 있는지 확인 (대부분 첫 항목에서 일치)
+        candidates = np.flatnonzero(found)
+        keys = _identity_keys(names.iloc[candidates], phones.iloc[candidates])
+        for i, key in zip(candidates, keys):
+            position = positions[i]
+            if self._keys[position] == key:
+                continue
+            end = np.searchsorted(self._hashes, hashes[i], side='right')
+            found[i] = key in self._keys[position:end]
+        return found
+
+    def __contains__(self, identifier: Tuple[Any, Any]) -> bool:
+        """(이름, 연락처) 하나가 색인에 있는지 확인합니다. (정규화 후 비교)"""
+        name, phone = identifier
+        return bool(self.contains(pd.Series([normalize_name(name)]), pd.Series([normalize_phone(phone)]))[0])
+
+
+class IdentifierIndexBuilder:
+    """
+    페이지 단위로 받은 (이름, 연락처)를 바로 정규화/해시해 쌓아 두었다가 IdentifierIndex를 만드는 빌더
+
+    응답 JSON 전체를 모아 두지 않고 페이지마다 해시 배열(항목당 8바이트)만 남기며,
+    여러 스레드에서 페이지를 동시에 추가할 수 있습니다.
+    """
+
+    def __init__(self, exact: Optional[bool] = None):
+        """
+        IdentifierIndexBuilder를 초기화합니다.
+
+        :param exact: 키까지 비교하는 색인을 만들지 여부 (기본값: 환경변수 IDENTIFIER_INDEX_EXACT 또는 False)
+        """
+        self.exact = exact if exact is not None else exact_index_enabled()
+        self._hashes = []
+        self._keys = []
+        self._lock = threading.Lock()
+
+    def add(self, names: Iterable[Any], phones: Iterable[Any]) -> int:
+        """
+        이름/연락처 한 페이지를 정규화해 추가합니다. 이름이나 연락처가 비어 있는 항목은 제외합니다.
+
+        :return: 추가된 항목 수
+        """
+        names = pd.Series([normalize_name(name) for name in names], dtype=object)
+        phones = pd.Series([normalize_phone(phone) for phone in phones], dtype=object)
+        valid = ((names != '') & (phones != '')).to_numpy()
+        names, phones = names[valid], phones[valid]
+        hashes = hash_identities(names, phones)
+        keys = _identity_keys(names, phones) if self.exact else None
+        with self._lock:
+            self._hashes.append(hashes)
+            if keys is not None:
+                self._keys.append(keys)
+        return len(hashes)
+
+    def build(self) -> IdentifierIndex:
+        """지금까지 추가한 항목으로 색인을 만듭니다."""
+        with self._lock:
+            hashes = np.concatenate(self._hashes) if self._hashes else np.empty(0, dtype=np.uint64)
+            keys = (np.concatenate(self._keys) if self._keys else np.empty(0, dtype=object)) if self.exact else None
+        return IdentifierIndex(hashes, keys)
+
+
+def drop_duplicate_identities(frame: pd.DataFrame, name_col: str = 'name', phone_col: str = 'phone') -> pd.DataFrame:
+    """같은 배치 안에서 (이름, 연락처)가 같은 행은 처음 행만 남깁니다."""
+    return frame.drop_duplicates(subset=[name_col, phone_col], keep='first')
@@ -10,19 +10,23 @@ import sys
 import logging
 import schedule
 import time
+import threading
 import traceback
-from datetime import datetime
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from supabase import create_client, Client
+import numpy as np
 import pandas as pd
 import re
 
 # src 디렉토리를 sys.path에 추가 (로컬 실행 시)
 # sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from .google_sheets_manager import GoogleSheetsManager
-from .supabase_manager import SupabaseManager
-from .notification.notification_manager import NotificationManager
+from .runtime import SyncRuntime
+from .sheet_catalog import SheetCatalog
+from .column_mappings import get_column_mapping_config
+from .identity import IdentifierIndex, drop_duplicate_identities
+from .supabase_manager import identity_key
 
 # --- 환경변수 로드 ---
 load_dotenv()
@@ -48,181 +52,401 @@ logger = logging.getLogger(__name__)
 # 스케줄링 간격 (분)
 SCHEDULE_MINUTES = 30
 
-def get_supabase_client() -> Client:
-    """Supabase 클라이언트를 생성하고 반환합니다."""
-    url = os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
-    if not url or not key:
-        raise ValueError("Supabase URL 또는 Service Role Key가 .env 파일에 설정되지 않았습니다.")
-    return create_client(url, key)
+# 시트 읽기 방식: auto (시트 크기/워터마크에 따라 api 또는 csv), api (Sheets API), csv (시트별 CSV 내보내기),
+# xlsx (엑셀 내보내기, calamine이 설치되어 있으면 calamine), openpyxl, calamine - 스프레드시트별로 덮어쓸 수 있음
+INGESTION_MODE = os.getenv('SHEETS_INGESTION_MODE', 'auto').lower()
 
+# 스프레드시트가 마지막 동기화 이후 변경되지 않았으면 동기화 주기를 건너뜀
+SKIP_UNCHANGED_SYNC = os.getenv('SKIP_UNCHANGED_SYNC', 'true').lower() == 'true'
 
-def sync_and_notify():
+# 시트별 워터마크 이후의 신규 행만 읽음 (api 모드 전용), 전체 재스캔 주기(시간)
+INCREMENTAL_SHEET_READS = os.getenv('INCREMENTAL_SHEET_READS', 'true').lower() == 'true'
+FULL_RESCAN_HOURS = float(os.getenv('FULL_RESCAN_HOURS', '24'))
+
+# 내보낸 전체 엑셀 파일을 downloads 보관소에 저장할지 여부 (동기화 자체는 메모리 버퍼로 처리)
+ARCHIVE_DOWNLOADS = os.getenv('ARCHIVE_DOWNLOADS', 'true').lower() == 'true'
+# api/csv 방식으로 읽어 엑셀을 내보내지 않은 주기에도 보관을 위해 전체 엑셀을 따로 내보낼지 여부
+# (리비전이 바뀔 때마다 Drive 내보내기가 한 번 더 발생하므로 기본값은 사용 안 함)
+ARCHIVE_EXPORT_WORKBOOK = os.getenv('ARCHIVE_EXPORT_WORKBOOK', 'false').lower() == 'true'
+
+# 동시에 동기화할 스프레드시트 수 (작업자 풀 크기)
+SYNC_MAX_WORKERS = int(os.getenv('SYNC_MAX_WORKERS', '4'))
+
+# 오늘부터 며칠 전까지의 날짜 시트를 처리할지 (1이면 오늘 시트만), 스프레드시트당 동시에 읽을 시트 수
+SHEET_DATE_WINDOW_DAYS = int(os.getenv('SHEET_DATE_WINDOW_DAYS', '1'))
+SHEET_READ_WORKERS = int(os.getenv('SHEET_READ_WORKERS', '4'))
+
+# 서로 의존하지 않는 단계를 겹쳐 실행 (시트 읽기 중 기존 식별자 미리 조회, 보관 중 알림 발송)
+OVERLAP_SYNC_STAGES = os.getenv('OVERLAP_SYNC_STAGES', 'true').lower() == 'true'
+
+# inquiry_type 목록(뷰 이름 -> inquiry_type)과 컬럼 매핑은 설정 파일(COLUMN_MAPPINGS_FILE)에서 불러옴
+MAPPING_CONFIG = get_column_mapping_config()
+INQUIRY_TYPES = MAPPING_CONFIG.inquiry_types
+COLUMN_MAPPINGS = MAPPING_CONFIG.mappings
+
+
+class SourceSnapshot:
+    """한 스프레드시트에서 이번 주기에 읽은 시트 데이터와, 동기화 완료 후 기록할 상태를 담는 클래스"""
+
+    def __init__(self, source, gs_manager, revision):
+        self.source = source
+        self.gs_manager = gs_manager
+        self.revision = revision
+        self.catalog = None
+        # (시트 이름, DataFrame, 새 워터마크) 리스트
+        self.sheets = []
+        # 엑셀로 내보낸 경우 버퍼를 한 번만 만들어 읽기/보관에 재사용
+        self.workbook = None
+        self.lock = threading.Lock()
+        # 선택된 시트를 모두 읽었는지 여부 (False면 리비전을 기록하지 않음)
+        self.complete = True
+        # 컬럼 매핑이 사용하는 컬럼만 읽고, 식별자 컬럼은 문자열로 읽음
+        self.mappings = source_mappings(source)
+        self.columns, self.text_columns = MAPPING_CONFIG.read_columns(self.mappings.values())
+
+    def workbook_bytes(self):
+        """엑셀 내보내기 내용을 반환합니다. (여러 시트를 병렬로 읽어도 내보내기는 한 번만 수행)"""
+        with self.lock:
+            if self.workbook is None:
+                self.workbook = self.gs_manager.export_workbook()
+            return self.workbook.getvalue() if self.workbook else None
+
+
+def source_mappings(source):
+    """스프레드시트에서 처리하는 inquiry_type별 컬럼 매핑을 반환합니다. (스프레드시트별 덮어쓰기 규칙 적용)"""
+    return {inquiry_type: source.get_column_mapping(inquiry_type, COLUMN_MAPPINGS[inquiry_type])
+            for inquiry_type in INQUIRY_TYPES.values() if source.handles(inquiry_type)}
+
+
+def select_recent_sheets(catalog, today, window_days=1):
+    """
+    오늘부터 window_days일 전까지의 날짜 시트 이름들을 최신 날짜 순으로 찾습니다.
+    매칭되는 시트가 하나도 없으면 첫 번째 시트를 반환합니다.
+
+    :param catalog: SheetCatalog (시트 이름의 날짜는 카탈로그를 만들 때 한 번만 파싱됨)
+    """
+    today = today.date() if isinstance(today, datetime) else today
+    selected_sheets = catalog.sheets_in_range(today - timedelta(days=max(1, window_days) - 1), today)
+    for sheet_name in selected_sheets:
+        logger.info(f"날짜와 매칭되는 시트를 찾았습니다: '{sheet_name}'")
+    
+    # 날짜 매칭 시트가 없으면 첫 번째 시트 사용
+    if not selected_sheets:
+        logger.warning(f"최근 날짜와 매칭되는 시트를 찾을 수 없어 첫 번째 시트를 사용합니다: '{catalog.titles[0]}'")
+        selected_sheets.append(catalog.titles[0])
+    return selected_sheets
+
+
+def read_sheet(snapshot, sheet_name, state_store):
+    """
+    스프레드시트의 시트 하나를 설정된 읽기 방식으로 읽습니다. (실패 시 다음 방식, 마지막은 메모리로 내보낸 엑셀)
+
+    :return: (DataFrame, 새 워터마크) 또는 실패 시 (None, None)
+    """
+    gs_manager = snapshot.gs_manager
+    header_row = snapshot.source.get_header_row(sheet_name)
+
+    # 이전 주기의 워터마크 이후에 추가된 행만 읽기 (api 방식)
+    watermark = None
+    if INCREMENTAL_SHEET_READS:
+        watermark = state_store.get('spreadsheets', gs_manager.spreadsheet_id, 'sheets', sheet_name, 'watermark')
+
+    # 매핑에 쓰이는 컬럼만 읽고, 엑셀 방식에서는 이름/연락처가 숫자로 추론되어 앞자리 0을 잃지 않도록 문자열로 읽음
+    # (날짜 컬럼은 설정 파일의 converters로 변환)
+    df, new_watermark, reader = gs_manager.read_sheet(
+        sheet_name, header_row=header_row, columns=snapshot.columns, text_columns=snapshot.text_columns,
+        reader=snapshot.source.reader or INGESTION_MODE, sheet_info=snapshot.catalog.get(sheet_name) or {},
+        watermark=watermark, full_rescan_hours=FULL_RESCAN_HOURS, load_workbook=snapshot.workbook_bytes
+    )
+    if df is None:
+        logger.error(f"[{snapshot.source.name}] '{sheet_name}' 시트를 읽지 못했습니다.")
+        # 실패 시 모든 시트 이름 출력
+        logger.info(f"사용 가능한 시트 목록: {snapshot.catalog.titles}")
+        return None, None
+
+    logger.info(f"[{snapshot.source.name}] 시트 '{sheet_name}'에서 {len(df)}개의 데이터를 가져왔습니다. (읽기 방식: {reader})")
+    logger.info(f"컬럼: {list(df.columns)}")
+    return df, new_watermark
+
+
+def read_source(runtime, source, on_changed=None):
+    """
+    스프레드시트 하나의 변경 여부를 확인하고, 변경된 경우 선택된 시트를 읽습니다.
+    작업자 풀에서 스프레드시트별로 동시에 실행됩니다.
+
+    :param on_changed: 스프레드시트가 변경되어 시트를 읽기 직전에 호출할 함수 (기존 식별자 미리 조회 시작)
+    :return: SourceSnapshot 또는 변경이 없거나 실패한 경우 None
+    """
+    try:
+        gs_manager = runtime.get_gs_manager(source)
+        state_store = runtime.state_store
+
+        # 0. 마지막 동기화 이후 스프레드시트가 변경되었는지 확인
+        file_revision = gs_manager.get_file_revision()
+        revision = None
+        if file_revision:
+            # 날짜가 바뀌면 선택되는 시트도 바뀌므로 날짜를 리비전 키에 포함
+            revision = f"{file_revision}|{datetime.now().strftime('%Y-%m-%d')}"
+        if SKIP_UNCHANGED_SYNC and not gs_manager.has_changed_since_last_sync(state_store, revision):
+            logger.info(f"✅ [{source.name}] 마지막 동기화 이후 스프레드시트가 변경되지 않아 건너뜁니다. (리비전: {revision})")
+            return None
+        if on_changed:
+            on_changed()
+
+        snapshot = SourceSnapshot(source, gs_manager, revision)
+
+        # 1. 시트 카탈로그 가져오기 (스프레드시트가 바뀌지 않았으면 캐시 사용)
+        snapshot.catalog = gs_manager.get_sheet_catalog(file_revision, state_store)
+        
+        # API 오류 시 폴백: 전체 다운로드 후 시트 목록 확인
+        if not snapshot.catalog or not snapshot.catalog.sheets:
+            logger.warning(f"[{source.name}] Google Sheets API로 시트 목록을 가져올 수 없습니다. 전체 파일을 다운로드하여 확인합니다.")
+            snapshot.workbook = gs_manager.export_workbook()
+            if not snapshot.workbook:
+                logger.error(f"[{source.name}] 스프레드시트를 다운로드할 수 없습니다.")
+                return None
+            try:
+                snapshot.catalog = SheetCatalog.from_titles(pd.ExcelFile(snapshot.workbook).sheet_names)
+                logger.info(f"다운로드한 파일에서 {len(snapshot.catalog.sheets)}개의 시트를 찾았습니다: {snapshot.catalog.titles}")
+            except Exception as e:
+                logger.error(f"[{source.name}] 엑셀 파일에서 시트 목록을 읽을 수 없습니다: {e}")
+                return None
+
+        # 2. 지정된 시트 또는 최근 날짜와 매칭되는 시트들 선택
+        if source.sheet_name:
+            selected_sheets = [source.sheet_name]
+        else:
+            window_days = source.date_window_days or SHEET_DATE_WINDOW_DAYS
+            selected_sheets = select_recent_sheets(snapshot.catalog, datetime.now(), window_days)
+
+        # 3. 선택된 시트들을 병렬로 읽기 (시트마다 자체 워터마크 사용)
+        with ThreadPoolExecutor(max_workers=max(1, min(SHEET_READ_WORKERS, len(selected_sheets)))) as executor:
+            results = list(executor.map(lambda sheet_name: read_sheet(snapshot, sheet_name, state_store), selected_sheets))
+
+        for sheet_name, (df, new_watermark) in zip(selected_sheets, results):
+            if df is None:
+                # 읽지 못한 시트가 있으면 리비전을 기록하지 않아 다음 주기에 다시 처리
+                snapshot.complete = False
+                continue
+            snapshot.sheets.append((sheet_name, df, new_watermark))
+
+        if not snapshot.sheets:
+            return None
+        return snapshot
+
+    except Exception:
+        logger.error(f"[{source.name}] 스프레드시트 처리 중 오류가 발생했습니다.")
+        logger.error(traceback.format_exc())
+        return None
+
+
+def commit_source(snapshot, state_store):
+    """동기화를 마친 스프레드시트의 시트별 워터마크와 리비전을 기록합니다. (다음 주기의 변경 감지 기준)"""
+    gs_manager = snapshot.gs_manager
+    if INCREMENTAL_SHEET_READS:
+        for sheet_name, _, new_watermark in snapshot.sheets:
+            if new_watermark:
+                state_store.set('spreadsheets', gs_manager.spreadsheet_id, 'sheets', sheet_name, 'watermark', value=new_watermark)
+        state_store.save()
+    if snapshot.complete:
+        gs_manager.mark_synced(state_store, snapshot.revision)
+
+
+def archive_source(snapshot):
+    """
+    다운로드 보관 (선택 사항, 동기화 경로와 분리된 부가 작업)
+    시트를 읽으며 내보낸 엑셀이 없으면 ARCHIVE_EXPORT_WORKBOOK이 켜져 있을 때만 보관용으로 따로 내보냅니다.
+    """
+    save_all_sheets = os.getenv('SAVE_ALL_SHEETS', 'true').lower() == 'true'
+    if not (ARCHIVE_DOWNLOADS or save_all_sheets):
+        return
+
+    try:
+        gs_manager = snapshot.gs_manager
+        workbook = snapshot.workbook
+        if workbook is None:
+            if not ARCHIVE_EXPORT_WORKBOOK:
+                logger.debug(f"[{snapshot.source.name}] 이번 주기에 내보낸 엑셀이 없어 보관하지 않습니다. "
+                             f"(ARCHIVE_EXPORT_WORKBOOK=true면 따로 내보내 보관)")
+                return
+            workbook = gs_manager.export_workbook()
+        if not workbook:
+            return
+
+        if ARCHIVE_DOWNLOADS:
+            gs_manager.archive_workbook(workbook)
+        if save_all_sheets:
+            logger.info(f"📥 [{snapshot.source.name}] 모든 시트를 개별 파일로 저장합니다...")
+            downloaded_files = gs_manager.archive_all_sheets(workbook)
+            logger.info(f"총 {len(downloaded_files)}개의 시트 파일을 저장했습니다.")
+        # 보관 정책(기간/용량)에 따라 오래된 스냅샷 정리
+        gs_manager.get_archive().prune()
+        logger.info(f"📁 다운로드된 파일들은 'downloads' 폴더에 내용 해시 기준으로 보관됩니다.")
+    except Exception as e:
+        logger.error(f"[{snapshot.source.name}] 다운로드 보관 실패: {e}")
+
+
+def sync_and_notify(runtime: SyncRuntime = None):
     """
     데이터 동기화 및 알림 발송 작업을 수행하는 메인 함수.
+    설정된 모든 스프레드시트를 작업자 풀에서 동시에 읽은 뒤, 신규 데이터를 한 번에 삽입하고 알림을 발송합니다.
+    OVERLAP_SYNC_STAGES가 켜져 있으면 기존 식별자는 시트를 읽는 동안 미리 조회하고,
+    알림은 리비전 기록/다운로드 보관과 동시에 발송합니다.
+
+    :param runtime: 주기 사이에 재사용할 클라이언트 묶음 (없으면 이번 주기용으로 새로 생성)
     """
-    excel_path = None
+    # 시트 읽기/보관과 겹쳐 실행할 단계 (기존 식별자 미리 조회, 알림 발송)
+    stage_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='sync-stage') if OVERLAP_SYNC_STAGES else None
     try:
         logger.info("="*50)
         logger.info("🚀 동기화 작업을 시작합니다.")
         logger.info(f"실행 시간: {datetime.now()}")
 
-        supabase_client = get_supabase_client()
-        gs_manager = GoogleSheetsManager()
-        sb_manager = SupabaseManager(supabase_client)
-        notification_manager = NotificationManager()
+        runtime = runtime or SyncRuntime()
+        runtime.prepare_cycle()
+        sources = runtime.sources
+        sb_manager = runtime.sb_manager
+        notification_manager = runtime.notification_manager
+        state_store = runtime.state_store
 
-        # 1. 스프레드시트의 모든 시트 이름 가져오기
-        sheet_names = gs_manager.get_sheet_names()
-        
-        # API 오류 시 폴백: 전체 다운로드 후 시트 목록 확인
-        if not sheet_names:
-            logger.warning("Google Sheets API로 시트 목록을 가져올 수 없습니다. 전체 파일을 다운로드하여 확인합니다.")
-            temp_excel = gs_manager.download_sheet_as_excel()
-            if temp_excel:
-                try:
-                    xl_file = pd.ExcelFile(temp_excel)
-                    sheet_names = xl_file.sheet_names
-                    logger.info(f"다운로드한 파일에서 {len(sheet_names)}개의 시트를 찾았습니다: {sheet_names}")
-                except Exception as e:
-                    logger.error(f"엑셀 파일에서 시트 목록을 읽을 수 없습니다: {e}")
-                    return
-            else:
-                logger.error("스프레드시트를 다운로드할 수 없습니다.")
-                return
+        # 기존 식별자는 시트 내용과 상관없으므로 시트를 읽는 동안 미리 조회 (upsert/rpc 방식은 DB가 중복을 걸러내므로 조회하지 않음)
+        # 변경된 스프레드시트가 하나도 없는 주기에는 조회하지 않도록 처음으로 변경이 확인된 스프레드시트에서 시작
+        prefetch_futures = []
+        prefetch_lock = threading.Lock()
+
+        def start_prefetch():
+            with prefetch_lock:
+                if not prefetch_futures:
+                    prefetch_futures.append(stage_executor.submit(sb_manager.get_existing_identifiers))
+
+        on_changed = start_prefetch if stage_executor and not sb_manager.server_side_dedupe else None
+
+        # 1. 스프레드시트별 변경 감지 및 시트 읽기 (제한된 작업자 풀에서 동시에 처리)
+        with ThreadPoolExecutor(max_workers=max(1, min(SYNC_MAX_WORKERS, len(sources)))) as executor:
+            snapshots = [snapshot for snapshot in executor.map(lambda source: read_source(runtime, source, on_changed), sources)
+                         if snapshot]
+        prefetch = prefetch_futures[0] if prefetch_futures else None
+
+        if not snapshots:
+            logger.info("✅ 새로 처리할 스프레드시트가 없어 이번 주기를 마칩니다.")
+            return
 
-        # 2. 오늘 날짜와 매칭되는 시트 찾기
-        today = datetime.now()
-        date_patterns = [
-            today.strftime("%Y-%m-%d"),    # 2025-07-17
-            today.strftime("%Y.%m.%d"),    # 2025.07.17
-            today.strftime("%Y%m%d"),      # 20250717
-            today.strftime("%m-%d"),       # 07-17
-            today.strftime("%m.%d"),       # 07.17
-            today.strftime("%m%d"),        # 0717
-            today.strftime("%-m.%-d"),     # 7.17 (앞의 0 제거)
-            today.strftime("%-m-%-d"),     # 7-17 (앞의 0 제거)
-        ]
-        
-        # 추가: 한국어 날짜 형식
-        korean_date_patterns = [
-            f"{today.month}월{today.day}일",
-            f"{today.month}월 {today.day}일",
-        ]
-        date_patterns.extend(korean_date_patterns)
-        
-        selected_sheet = None
-        for sheet_name in sheet_names:
-            for pattern in date_patterns:
-                if pattern in sheet_name:
-                    selected_sheet = sheet_name
-                    logger.info(f"날짜 패턴 '{pattern}'과 매칭되는 시트를 찾았습니다: '{sheet_name}'")
-                    break
-            if selected_sheet:
-                break
-        
-        # 날짜 매칭 시트가 없으면 첫 번째 시트 사용
-        if not selected_sheet:
-            selected_sheet = sheet_names[0]
-            logger.warning(f"오늘 날짜와 매칭되는 시트를 찾을 수 없어 첫 번째 시트를 사용합니다: '{selected_sheet}'")
-
-        # 3. 모든 데이터 타입별로 처리
-        # inquiry_type에 따른 뷰 매핑
-        inquiry_types = {
-            'estimates': '견적 의뢰',
-            'consultations': '상담 문의', 
-            'inquiries': '문의 사항',
-            'cctv_management': 'CCTV 관리',
-            'careon_applications': '케어온 신청'
-        }
-        
         # 전체 신규 데이터 카운트
         total_new_records = 0
         all_new_records = []
+        # 일시적 오류로 삽입에 실패한 행이 있으면 리비전을 기록하지 않아 다음 주기에 다시 처리
+        insert_failed = False
 
-        # 4. 모든 시트를 개별 파일로 다운로드 (옵션)
-        save_all_sheets = os.getenv('SAVE_ALL_SHEETS', 'true').lower() == 'true'
-        if save_all_sheets:
-            logger.info("📥 모든 시트를 개별 파일로 저장합니다...")
-            downloaded_files = gs_manager.download_all_sheets_separately()
-            logger.info(f"총 {len(downloaded_files)}개의 시트 파일을 저장했습니다.")
-            
-            # 선택된 시트의 파일 경로 찾기
-            excel_path = downloaded_files.get(selected_sheet)
-            if not excel_path:
-                # 전체 다운로드 실패 시 기본 방식으로 다운로드
-                excel_path = gs_manager.download_sheet_as_excel()
-        else:
-            # 5. Google Sheets에서 최신 데이터 가져오기 (전체 엑셀로 다운로드)
-            excel_path = gs_manager.download_sheet_as_excel()
-            
-        if not excel_path:
-            logger.error("Google Sheets 다운로드에 실패하여 동기화를 중단합니다.")
-            return
+        # 2. 시트별로 한 번만 훑어 모든 inquiry_type의 신규 후보를 분류
+        routed_sheets = []
+        for snapshot in snapshots:
+            for sheet_name, df, _ in snapshot.sheets:
+                routed_sheets.append((sheet_name, route_sheet_rows(df, snapshot.mappings)))
 
-        # 6. 다운로드한 엑셀 파일에서 선택된 시트 읽기
-        try:
-            # 개별 시트 파일인지 전체 파일인지 확인
-            if save_all_sheets and excel_path in downloaded_files.values():
-                # 개별 시트 파일인 경우 sheet_name 파라미터 제거
-                if selected_sheet == '케어온':
-                    latest_data_df = pd.read_excel(excel_path)
-                else:
-                    latest_data_df = pd.read_excel(excel_path, skiprows=1)
-            else:
-                # 전체 엑셀 파일인 경우 sheet_name 파라미터 사용
-                if selected_sheet == '케어온':
-                    latest_data_df = pd.read_excel(excel_path, sheet_name=selected_sheet)
-                else:
-                    latest_data_df = pd.read_excel(excel_path, sheet_name=selected_sheet, skiprows=1)
-            
-            logger.info(f"시트 '{selected_sheet}'에서 {len(latest_data_df)}개의 데이터를 가져왔습니다.")
-            logger.info(f"컬럼: {list(latest_data_df.columns)}")
-        except Exception as e:
-            logger.error(f"'{selected_sheet}' 시트를 읽는 중 오류 발생: {e}")
-            # 실패 시 모든 시트 이름 출력
-            logger.info(f"사용 가능한 시트 목록: {sheet_names}")
+        # 3. 모든 inquiry_type의 기존 식별자를 기반 테이블에서 한 번에 조회 (미리 조회했으면 그 결과를 기다림)
+        if sb_manager.server_side_dedupe:
+            existing_by_type = {}
+        elif prefetch:
+            waited = time.monotonic()
+            existing_by_type = prefetch.result()
+            logger.info(f"미리 조회한 기존 식별자를 {time.monotonic() - waited:.1f}초 기다렸습니다.")
+        else:
+            existing_by_type = sb_manager.get_existing_identifiers()
+        if existing_by_type is None:
+            # 기존 식별자 없이 비교하면 모든 행이 신규로 보이므로 워터마크/리비전을 기록하지 않고 다음 주기에 다시 처리
+            logger.error("기존 식별자를 조회하지 못해 이번 주기를 건너뜁니다. (다음 주기에 다시 처리)")
             return
 
-        # 7. 각 inquiry_type별로 처리
-        for view_name, inquiry_type in inquiry_types.items():
+        # 4. 각 inquiry_type별로 신규 데이터를 골라 한 번에 삽입할 목록에 모음 (기존 식별자는 모든 스프레드시트가 공유)
+        pending_records = []
+        pending_types = []
+        # 시트의 '문의' 값으로 inquiry_type이 바뀐 레코드도 있으므로 기존 식별자와 배치 내 중복은 모두 저장될 키
+        # (inquiry_type, name, phone)로 비교
+        pending_identities = set()
+        for view_name, inquiry_type in INQUIRY_TYPES.items():
             logger.info(f"\n--- {inquiry_type} ({view_name}) 처리 중 ---")
+            if not sb_manager.server_side_dedupe:
+                logger.info(f"{inquiry_type}: Supabase에 {len(existing_by_type.get(inquiry_type, ()))}개의 기존 데이터가 있습니다.")
             
-            # 해당 타입의 기존 데이터 식별자 가져오기
-            existing_identifiers = sb_manager.get_existing_identifiers(view_name, ['name', 'phone_number'])
-            logger.info(f"{inquiry_type}: Supabase에 {len(existing_identifiers)}개의 기존 데이터가 있습니다.")
-            
-            # 신규 데이터 필터링
-            new_records = filter_new_data_by_type(latest_data_df, existing_identifiers, selected_sheet, inquiry_type)
+            # 스프레드시트/시트별 신규 데이터 필터링 후 병합 (여러 시트에 같은 사람이 있으면 한 번만 삽입)
+            new_records = []
+            for sheet_name, routed in routed_sheets:
+                if inquiry_type not in routed:
+                    continue
+                for record in build_new_records(routed[inquiry_type], existing_by_type, sheet_name, inquiry_type):
+                    if identity_key(record) not in pending_identities:
+                        pending_identities.add(identity_key(record))
+                        new_records.append(record)
             
             if new_records:
                 logger.info(f"🆕 {inquiry_type}: {len(new_records)}개의 신규 데이터를 발견했습니다.")
-                
-                # Supabase에 삽입
-                sb_manager.insert_customer_inquiries(new_records)
-                
-                # 알림용 데이터 저장
-                for record in new_records:
-                    record['inquiry_type_display'] = inquiry_type
-                all_new_records.extend(new_records)
-                total_new_records += len(new_records)
+                pending_records.extend(new_records)
+                pending_types.extend([inquiry_type] * len(new_records))
             else:
                 logger.info(f"✅ {inquiry_type}: 새로운 데이터가 없습니다.")
 
-        # 8. 모든 신규 데이터에 대한 알림 발송
+        # 5. 모든 inquiry_type의 신규 데이터를 Supabase에 한 번에 삽입
+        # (실제로 삽입된 레코드만 알림, DB가 걸러낸 중복과 실패한 행은 제외)
+        if pending_records:
+            result = sb_manager.write_customer_inquiries(pending_records)
+            # 데이터 오류로 실패한 행은 다시 보내도 실패하므로 기록만 하고 워터마크/리비전은 저장
+            for record, error in result.permanently_failed:
+                logger.error(f"삽입 실패 (데이터 오류, 다시 시도하지 않음): {record.get('sheet_name')} "
+                             f"{record.get('name')} ({record.get('phone')}) - {error}")
+            # 일시적 오류로 재시도 횟수를 넘긴 행이 있으면 리비전을 기록하지 않아 다음 주기에 다시 처리
+            for record, error in result.retryable_failed:
+                insert_failed = True
+                logger.error(f"삽입 실패 (일시적 오류, 다음 주기에 다시 시도): {record.get('name')} ({record.get('phone')}) - {error}")
+            # 삽입 여부를 확인할 수 없는 행은 다시 보내지 않음 (실제로 삽입됐다면 다음 조회에서 기존 식별자로 인식)
+            for record, status in zip(pending_records, result.statuses):
+                if status == 'unknown':
+                    logger.warning(f"삽입 여부 확인 불가 (다시 보내지 않고 알림 제외): {record.get('name')} ({record.get('phone')})")
+            sb_manager.cache_inserted(result.inserted_records)
+
+            # 알림용 데이터 저장
+            for record, status, inquiry_type in zip(pending_records, result.statuses, pending_types):
+                if status == 'inserted':
+                    record['inquiry_type_display'] = inquiry_type
+                    all_new_records.append(record)
+            total_new_records = len(all_new_records)
+
+        # 6. 모든 신규 데이터에 대한 알림 발송 (단계를 겹쳐 실행하면 리비전 기록/보관과 동시에 발송)
+        notify = None
         if all_new_records:
             logger.info(f"\n🔔 총 {total_new_records}개의 신규 데이터에 대한 알림을 발송합니다.")
-            send_slack_notifications(all_new_records, notification_manager)
+            if stage_executor:
+                notify = stage_executor.submit(send_slack_notifications, all_new_records, notification_manager)
+            else:
+                send_slack_notifications(all_new_records, notification_manager)
         else:
             logger.info("\n✅ 모든 데이터가 최신 상태입니다. 새로운 데이터가 없습니다.")
 
-        # 파일은 삭제하지 않고 보관
-        logger.info(f"📁 다운로드된 파일들은 'downloads' 폴더에 보관됩니다.")
+        # 7. 처리 완료된 워터마크와 리비전 기록
+        if insert_failed:
+            logger.warning("일부 데이터가 일시적 오류로 삽입에 실패하여 다음 주기에 다시 처리합니다.")
+        else:
+            for snapshot in snapshots:
+                commit_source(snapshot, state_store)
+
+        # 8. 다운로드 보관 (스프레드시트별로 동시에 처리)
+        with ThreadPoolExecutor(max_workers=max(1, min(SYNC_MAX_WORKERS, len(snapshots)))) as executor:
+            list(executor.map(archive_source, snapshots))
+
+        if notify:
+            try:
+                notify.result()
+            except Exception as e:
+                logger.error(f"알림 발송 중 오류가 발생했습니다: {e}")
             
-        except Exception as e:
+    except Exception as e:
         logger.error("동기화 작업 중 심각한 오류가 발생했습니다.")
         logger.error(traceback.format_exc())
     finally:
+        if stage_executor:
+            # 미리 시작한 조회/알림이 끝날 때까지 기다림 (변경된 스프레드시트의 시트 읽기가 모두 실패했을 때 포함)
+            stage_executor.shutdown(wait=True)
+        if runtime:
+            logger.info(f"📊 이번 주기 Google API 사용량: {runtime.api_limiter.usage_summary()}")
         logger.info("✨ 동기화 작업이 종료되었습니다.")
         logger.info("="*50 + "\n")
 
@@ -262,134 +486,127 @@ def filter_new_data(df, existing_identifiers, sheet_name):
             
     return new_records
 
-def filter_new_data_by_type(df, existing_identifiers, sheet_name, inquiry_type):
-    """inquiry_type별로 DataFrame에서 신규 데이터를 필터링하고 유효성을 검사합니다."""
+def route_sheet_rows(df, mappings):
+    """
+    한 시트의 행을 여러 inquiry_type의 신규 후보로 한 번에 분류합니다.
+    컬럼 매핑은 시트 헤더별로 컴파일된 추출 계획(ExtractionPlan)으로 적용하고, 같은 매핑을 쓰는
+    inquiry_type들은 시트를 한 번만 훑어 후보를 공유하므로 inquiry_type이 늘어나도 서로 다른 매핑 수만큼만 비용이 듭니다.
+
+    :param df: 시트 DataFrame
+    :param mappings: {inquiry_type: 컬럼 매핑}
+    :return: {inquiry_type: 후보 DataFrame} (필수 컬럼이 없는 inquiry_type은 제외)
+    """
+    # 같은 매핑과 헤더 조합은 같은 컴파일된 추출 계획을 공유
+    groups = {}
+    for inquiry_type, mapping in mappings.items():
+        plan = MAPPING_CONFIG.compile(mapping, df.columns)
+        groups.setdefault(id(plan), (plan, []))[1].append(inquiry_type)
+
+    routed = {}
+    for plan, inquiry_types in groups.values():
+        candidates = plan.extract(df)
+        if candidates is None:
+            logger.warning(f"{', '.join(inquiry_types)}: 필수 컬럼이 없습니다: {plan.missing_cols}")
+            logger.info(f"사용 가능한 컬럼: {list(df.columns)}")
+            continue
+        for inquiry_type in inquiry_types:
+            routed[inquiry_type] = candidates
+    return routed
+
+
+def _exists_as_stored(candidates, existing_by_type, inquiry_type):
+    """
+    후보 행이 저장될 inquiry_type(시트의 '문의' 값이 있으면 그 값, 없으면 inquiry_type)의 기존 식별자에 있는지 확인합니다.
+
+    :param existing_by_type: 저장된 inquiry_type -> 기존 식별자 IdentifierIndex
+    :return: 행별 존재 여부 bool 배열
+    """
+    exists = np.zeros(len(candidates), dtype=bool)
+    if 'inquiry_type' in candidates.columns:
+        stored = candidates['inquiry_type']
+        stored_types = np.array([str(value) if present else inquiry_type
+                                 for value, present in zip(stored.tolist(), stored.notna().to_numpy())], dtype=object)
+    else:
+        stored_types = np.full(len(candidates), inquiry_type, dtype=object)
+    for stored_type in pd.unique(stored_types):
+        index = existing_by_type.get(stored_type)
+        if index is None or not len(index):
+            continue
+        selected = stored_types == stored_type
+        exists[selected] = index.contains(candidates['name'][selected], candidates['phone'][selected])
+    return exists
+
+
+def build_new_records(candidates, existing_identifiers, sheet_name, inquiry_type):
+    """
+    후보 행 중 기존 식별자에 없는 행만 골라 삽입할 레코드로 만듭니다.
+    후보와 기존 식별자는 모두 identity 모듈의 규칙으로 정규화된 (이름, 연락처)입니다.
+    기존 식별자와는 컬럼 단위로 anti-join하고, 레코드 딕셔너리는 남은 행에 대해서만 만듭니다.
+
+    :param candidates: route_sheet_rows()가 반환한 후보 DataFrame
+    :param existing_identifiers: 저장된 inquiry_type -> 기존 식별자 IdentifierIndex 딕셔너리 (행마다 저장될 inquiry_type의
+                                 색인과 비교), 또는 모든 행에 적용할 IdentifierIndex ((name, phone) 튜플 집합이면 색인으로 변환)
+    :return: 신규 레코드 리스트
+    """
     new_records = []
-    df = df.where(pd.notnull(df), None)  # NaN을 None으로 변환
-    
-    # inquiry_type별 컬럼 매핑
-    column_mappings = {
-        '견적 의뢰': {
-            'name_col': '이름',
-            'phone_col': '전화번호',
-            'required_cols': ['이름', '전화번호'],
-            'extra_fields': {
-                'inquiry_type': '문의',
-                'region': '지역',
-                'consultation_content': '상담내용(EA)',
-                'channel': '채널',
-                'form_type': '형태'
-            }
-        },
-        '상담 문의': {
-            'name_col': '이름',
-            'phone_col': '전화번호',
-            'required_cols': ['이름', '전화번호'],
-            'extra_fields': {
-                'inquiry_type': '문의',
-                'region': '지역',
-                'consultation_content': '상담내용(EA)',
-                'channel': '채널',
-                'form_type': '형태'
-            }
-        },
-        '문의 사항': {
-            'name_col': '이름',
-            'phone_col': '전화번호',
-            'required_cols': ['이름', '전화번호'],
-            'extra_fields': {
-                'inquiry_type': '문의',
-                'region': '지역',
-                'consultation_content': '상담내용(EA)',
-                'channel': '채널',
-                'form_type': '형태'
-            }
-        },
-        'CCTV 관리': {
-            'name_col': '이름',
-            'phone_col': '전화번호',
-            'required_cols': ['이름', '전화번호'],
-            'extra_fields': {
-                'inquiry_type': '문의',
-                'region': '지역',
-                'consultation_content': '상담내용(EA)',
-                'channel': '채널',
-                'form_type': '형태'
-            }
-        },
-        '케어온 신청': {
-            'name_col': '이름',
-            'phone_col': '연락처',
-            'required_cols': ['이름', '연락처'],
-            'extra_fields': {
-                'application_datetime': '신청일시',
-                'installation_location': '설치장소',
-                'address': '주소',
-                'installation_count': '설치대수',
-                'privacy_consent': '개인정보동의'
-            }
-        }
-    }
-    
-    # 해당 inquiry_type의 매핑 정보 가져오기
-    mapping = column_mappings.get(inquiry_type, {})
-    if not mapping:
-        logger.warning(f"알 수 없는 inquiry_type: {inquiry_type}")
+    if candidates is None or candidates.empty:
         return new_records
-    
-    name_col = mapping['name_col']
-    phone_col = mapping['phone_col']
-    
-    # 필수 컬럼이 있는지 확인
-    missing_cols = []
-    for col in mapping['required_cols']:
-        if col not in df.columns:
-            missing_cols.append(col)
-    
-    if missing_cols:
-        logger.warning(f"{inquiry_type}: 필수 컬럼이 없습니다: {missing_cols}")
-        logger.info(f"사용 가능한 컬럼: {list(df.columns)}")
+
+    # 같은 시트 안의 중복 행은 한 번만 삽입
+    candidates = drop_duplicate_identities(candidates)
+    if isinstance(existing_identifiers, dict):
+        exists = _exists_as_stored(candidates, existing_identifiers, inquiry_type)
+    else:
+        if not isinstance(existing_identifiers, IdentifierIndex):
+            pairs = list(existing_identifiers)
+            existing_identifiers = IdentifierIndex.from_identities([name for name, _ in pairs], [phone for _, phone in pairs])
+        exists = existing_identifiers.contains(candidates['name'], candidates['phone'])
+    rows = candidates[~exists]
+    if rows.empty:
         return new_records
 
-    for index, row in df.iterrows():
-        # 이름과 연락처 가져오기
-        name = row.get(name_col)
-        phone = row.get(phone_col)
+    # 추가 필드 (null이 아닌 값만 추가)
+    extra_columns = [(db_field, rows[db_field].tolist(), rows[db_field].notna().to_numpy())
+                     for db_field in rows.columns[2:]]
+    created_at = datetime.now().isoformat()
+
+    for i, (name, phone) in enumerate(zip(rows['name'].tolist(), rows['phone'].tolist())):
+        # 기본 필드
+        record = {
+            'name': name,
+            'phone': phone,
+            'inquiry_type': inquiry_type,
+            'sheet_name': sheet_name,
+            'created_at': created_at
+        }
+        for db_field, values, present in extra_columns:
+            if present[i]:
+                record[db_field] = values[i]
+        new_records.append(record)
 
-        # 필수 값 유효성 검사
-        if not name or not phone:
-            continue
-        
-        # 연락처 정제 (숫자만 추출)
-        phone_cleaned = re.sub(r'\D', '', str(phone))
-        
-        current_identifier = (str(name), phone_cleaned)
-        
-        if current_identifier not in existing_identifiers:
-            # 기본 필드
-            record = {
-                'name': name,
-                'phone': phone_cleaned,
-                'inquiry_type': inquiry_type,
-                'sheet_name': sheet_name,
-                'created_at': datetime.now().isoformat()
-            }
-            
-            # inquiry_type별 추가 필드 매핑
-            for db_field, sheet_col in mapping.get('extra_fields', {}).items():
-                if sheet_col in row:
-                    value = row.get(sheet_col)
-                    if pd.notna(value):  # null이 아닌 경우만 추가
-                        record[db_field] = value
-            
-            new_records.append(record)
-            
     return new_records
 
+
+def filter_new_data_by_type(df, existing_identifiers, sheet_name, inquiry_type, mapping=None):
+    """
+    inquiry_type별로 DataFrame에서 신규 데이터를 필터링하고 유효성을 검사합니다.
+    여러 inquiry_type을 함께 처리할 때는 route_sheet_rows()로 시트를 한 번만 훑는 편이 효율적입니다.
+
+    :param mapping: 사용할 컬럼 매핑 (없으면 COLUMN_MAPPINGS의 기본 매핑)
+    """
+    # 해당 inquiry_type의 매핑 정보 가져오기
+    mapping = mapping or COLUMN_MAPPINGS.get(inquiry_type, {})
+    if not mapping:
+        logger.warning(f"알 수 없는 inquiry_type: {inquiry_type}")
+        return []
+
+    candidates = route_sheet_rows(df, {inquiry_type: mapping}).get(inquiry_type)
+    return build_new_records(candidates, existing_identifiers, sheet_name, inquiry_type)
+
 def send_slack_notifications(new_records, notification_manager):
     """신규 데이터에 대한 슬랙 알림을 발송합니다."""
-        if not new_records:
-            return
+    if not new_records:
+        return
 
     # inquiry_type별로 그룹화
     grouped_records = {}
@@ -424,18 +641,11 @@ def send_slack_notifications(new_records, notification_manager):
             
             # 타입별 추가 정보 표시
             extra_info = ""
-            if inquiry_type == '케어온 신청':
-                location = record.get('installation_location', '')
-                if location:
-                    extra_info = f" | 설치장소: {location}"
-            elif inquiry_type == '견적 의뢰':
-                company = record.get('company', '')
-                if company:
-                    extra_info = f" | 회사: {company}"
-            elif inquiry_type == 'CCTV 관리':
-                location = record.get('location', '')
-                if location:
-                    extra_info = f" | 위치: {location}"
+            summary_field = MAPPING_CONFIG.summary_field(inquiry_type)
+            if summary_field:
+                value = record.get(summary_field['field'], '')
+                if value:
+                    extra_info = f" | {summary_field['label']}: {value}"
             
             message_parts.append(f"  {i+1}. {name} ({phone_formatted}){extra_info}")
         
@@ -467,11 +677,14 @@ def main():
     logger.info("CCTV 데이터 동기화 시스템이 시작되었습니다.")
     logger.info(f"매 {SCHEDULE_MINUTES}분마다 동기화 작업이 실행됩니다.")
     
+    # 클라이언트는 한 번만 만들어 모든 주기에서 재사용
+    runtime = SyncRuntime()
+
     # 프로그램 시작 시 한 번 즉시 실행
-    sync_and_notify()
+    sync_and_notify(runtime)
     
     # 스케줄 설정
-    schedule.every(SCHEDULE_MINUTES).minutes.do(sync_and_notify)
+    schedule.every(SCHEDULE_MINUTES).minutes.do(sync_and_notify, runtime)
     
     while True:
         schedule.run_pending()
@@ -0,0 +1,106 @@
+"""
+알림 채널(슬랙, 카카오톡)이 함께 쓰는 HTTP 전송 계층
+
+채널마다 요청할 때마다 연결을 새로 맺지 않도록 프로세스 전체가 하나의 연결 풀(keep-alive)을 공유하고,
+응답이 없는 서버 때문에 동기화 주기가 멈추지 않도록 모든 요청에 연결/읽기 시간 제한을 둡니다.
+httpx와 h2가 설치되어 있으면 HTTP/2 클라이언트를, 없으면 requests 세션을 사용합니다.
+"""
+
+import os
+import logging
+import threading
+import importlib.util
+from typing import Any, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """HTTP/2 클라이언트(httpx + h2)를 사용할 수 있는지 확인합니다."""
+    return importlib.util.find_spec('httpx') is not None and importlib.util.find_spec('h2') is not None
+
+
+class HttpTransport:
+    """
+    연결 풀과 시간 제한이 설정된 HTTP 클라이언트
+
+    requests 세션에는 연결 단계 오류만 재시도하는 어댑터를 붙입니다.
+    (요청이 서버에 전달된 뒤의 오류를 재시도하면 같은 메시지가 두 번 발송될 수 있음)
+    """
+
+    def __init__(self, connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None,
+                 pool_size: Optional[int] = None, http2: Optional[bool] = None):
+        """
+        HttpTransport를 초기화합니다.
+
+        :param connect_timeout: 연결 시간 제한 (초, 기본값: 환경변수 NOTIFICATION_CONNECT_TIMEOUT 또는 3)
+        :param read_timeout: 응답 읽기 시간 제한 (초, 기본값: 환경변수 NOTIFICATION_READ_TIMEOUT 또는 10)
+        :param pool_size: 호스트별로 유지할 연결 수 (기본값: 환경변수 NOTIFICATION_POOL_SIZE 또는 4)
+        :param http2: HTTP/2 사용 여부 (기본값: 환경변수 NOTIFICATION_HTTP2 또는 true, httpx와 h2가 없으면 사용하지 않음)
+        """
+        self.connect_timeout = connect_timeout if connect_timeout is not None else float(
+            os.getenv('NOTIFICATION_CONNECT_TIMEOUT', '3'))
+        self.read_timeout = read_timeout if read_timeout is not None else float(
+            os.getenv('NOTIFICATION_READ_TIMEOUT', '10'))
+        pool_size = pool_size or int(os.getenv('NOTIFICATION_POOL_SIZE', '4'))
+        connect_retries = int(os.getenv('NOTIFICATION_CONNECT_RETRIES', '2'))
+        if http2 is None:
+            http2 = os.getenv('NOTIFICATION_HTTP2', 'true').lower() == 'true'
+        self.http2 = http2 and http2_available()
+
+        if self.http2:
+            import httpx
+            # transport를 직접 넘기면 Client의 http2/limits 인자는 무시되므로 transport에 설정
+            self._client = httpx.Client(
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                transport=httpx.HTTPTransport(
+                    http2=True, retries=connect_retries,
+                    limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                ),
+            )
+            self.errors: Tuple[type, ...] = (httpx.HTTPError,)
+        else:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                                  max_retries=Retry(total=connect_retries, connect=connect_retries, read=0,
+                                                    status=0, other=0, backoff_factor=0.3))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._client = session
+            self.errors = (requests.exceptions.RequestException,)
+        logger.info(f"알림 HTTP 전송 계층: {'httpx (HTTP/2)' if self.http2 else 'requests (HTTP/1.1 keep-alive)'}, "
+                    f"시간 제한 연결 {self.connect_timeout}초 / 읽기 {self.read_timeout}초")
+
+    def post(self, url: str, **kwargs: Any):
+        """
+        POST 요청을 보냅니다. 응답 객체는 status_code, json(), raise_for_status()를 제공합니다.
+
+        :param url: 요청 URL
+        :param kwargs: headers, json, data
+        :return: 응답 객체 (requests.Response 또는 httpx.Response)
+        :raises: self.errors에 있는 예외 (연결 실패, 시간 초과 등)
+        """
+        if not self.http2:
+            kwargs.setdefault('timeout', (self.connect_timeout, self.read_timeout))
+        return self._client.post(url, **kwargs)
+
+    def close(self) -> None:
+        """연결 풀을 닫습니다."""
+        self._client.close()
+
+
+_transport: Optional[HttpTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_http_transport() -> HttpTransport:
+    """프로세스 전체가 공유하는 HTTP 전송 계층을 반환합니다. (처음 사용할 때 한 번만 만듦)"""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HttpTransport()
+        return _transport
@@ -6,12 +6,13 @@ CCTV 신규 문의 및 케어온 신청 시 직원들에게 자동 알림
 
 import os
 import json
-import requests
 import logging
 from datetime import datetime
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
 
+from .http_transport import HttpTransport, get_http_transport
+
 # 환경 변수 로드
 load_dotenv()
 
@@ -21,8 +22,14 @@ logger = logging.getLogger(__name__)
 class KakaoNotification:
     """카카오톡 알림(나에게 보내기)을 처리하는 클래스"""
 
-    def __init__(self):
+    def __init__(self, transport: Optional[HttpTransport] = None):
+        """
+        KakaoNotification을 초기화합니다.
+
+        :param transport: 사용할 HTTP 전송 계층 (기본값: 프로세스 전체가 공유하는 연결 풀)
+        """
         self.logger = logging.getLogger(__name__)
+        self.transport = transport or get_http_transport()
         self.kakao_rest_api_key = os.getenv("KAKAO_REST_API_KEY")
         self.kakao_redirect_uri = os.getenv("KAKAO_REDIRECT_URI")
         self.kakao_code_path = os.getenv("KAKAO_AUTH_CODE_FILE_PATH", "kakao_code.json")
@@ -46,7 +53,11 @@ class KakaoNotification:
             "client_id": self.kakao_rest_api_key,
             "refresh_token": tokens['refresh_token']
         }
-        response = requests.post(url, data=data)
+        try:
+            response = self.transport.post(url, data=data)
+        except self.transport.errors as e:
+            self.logger.error(f"카카오 토큰 갱신 요청 실패: {e}")
+            return None
         
         if response.status_code != 200:
             self.logger.error(f"카카오 토큰 갱신 실패: {response.json()}")
@@ -93,7 +104,11 @@ class KakaoNotification:
             })
         }
 
-        response = requests.post(url, headers=headers, data=data)
+        try:
+            response = self.transport.post(url, headers=headers, data=data)
+        except self.transport.errors as e:
+            self.logger.error(f"카카오톡 메시지 발송 실패: {e}")
+            return False
         if response.status_code == 200 and response.json().get('result_code') == 0:
             self.logger.info("카카오톡 메시지가 성공적으로 발송되었습니다.")
             return True
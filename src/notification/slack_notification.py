@@ -5,14 +5,22 @@ CCTV 신규 문의 및 케어온 신청 시 슬랙으로 알림 발송
 """
 
 import os
-import requests
 import logging
+from typing import Optional
+
+from .http_transport import HttpTransport, get_http_transport
 
 class SlackNotification:
     """Slack 알림을 처리하는 클래스"""
 
-    def __init__(self):
+    def __init__(self, transport: Optional[HttpTransport] = None):
+        """
+        SlackNotification을 초기화합니다.
+
+        :param transport: 사용할 HTTP 전송 계층 (기본값: 프로세스 전체가 공유하는 연결 풀)
+        """
         self.logger = logging.getLogger(__name__)
+        self.transport = transport or get_http_transport()
         self.webhook_url = os.getenv("SLACK_WEBHOOK_URL")
 
         if not self.webhook_url:
@@ -36,10 +44,10 @@ class SlackNotification:
         data = {'text': message}
 
         try:
-            response = requests.post(self.webhook_url, headers=headers, json=data)
+            response = self.transport.post(self.webhook_url, headers=headers, json=data)
             response.raise_for_status()  # 2xx 응답 코드가 아닐 경우 예외 발생
             self.logger.info("슬랙 메시지가 성공적으로 발송되었습니다.")
             return True
-        except requests.exceptions.RequestException as e:
+        except self.transport.errors as e:
             self.logger.error(f"슬랙 메시지 발송 실패: {e}")
             return False
\ No newline at end of file
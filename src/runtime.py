@@ -0,0 +1,128 @@
+import os
+import logging
+import threading
+from typing import List, Optional
+from supabase import create_client, Client
+
+from .google_sheets_manager import GoogleSheetsManager
+from .google_api_limiter import GoogleApiLimiter, get_google_api_limiter
+from .supabase_manager import SupabaseManager
+from .identifier_cache import IdentifierCache
+from .sync_state import SyncStateStore
+from .sync_sources import SyncSource, load_sync_sources
+from .notification.notification_manager import NotificationManager
+
+
+def get_supabase_client() -> Client:
+    """Supabase 클라이언트를 생성하고 반환합니다."""
+    url = os.getenv('SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+    if not url or not key:
+        raise ValueError("Supabase URL 또는 Service Role Key가 .env 파일에 설정되지 않았습니다.")
+    return create_client(url, key)
+
+
+class SyncRuntime:
+    """
+    스케줄된 동기화 주기 사이에 재사용하는 클라이언트들을 보관하는 클래스
+
+    main()에서 한 번 만들어 매 주기 sync_and_notify()에 전달합니다.
+    각 클라이언트는 처음 사용할 때 생성되므로, 생성에 실패하면 해당 주기만 실패하고 다음 주기에 다시 시도합니다.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._supabase_client = None
+        self._sb_manager = None
+        self._sources = None
+        self._gs_managers = {}
+        self._credentials = None
+        self._notification_manager = None
+        self._state_store = None
+        self._identifier_cache = None
+
+    @property
+    def supabase_client(self) -> Client:
+        """공유 Supabase 클라이언트"""
+        with self._lock:
+            if self._supabase_client is None:
+                self._supabase_client = get_supabase_client()
+                self.logger.info("Supabase 클라이언트를 생성했습니다.")
+            return self._supabase_client
+
+    @property
+    def sb_manager(self) -> SupabaseManager:
+        """공유 SupabaseManager"""
+        with self._lock:
+            if self._sb_manager is None:
+                self._sb_manager = SupabaseManager(self.supabase_client, identifier_cache=self.identifier_cache)
+            return self._sb_manager
+
+    @property
+    def identifier_cache(self) -> Optional[IdentifierCache]:
+        """기존 식별자 로컬 캐시 (IDENTIFIER_CACHE_ENABLED=false이면 None)"""
+        with self._lock:
+            if self._identifier_cache is None and os.getenv('IDENTIFIER_CACHE_ENABLED', 'true').lower() == 'true':
+                self._identifier_cache = IdentifierCache()
+                self.logger.info(f"로컬 식별자 캐시를 사용합니다: {self._identifier_cache.cache_path}")
+            return self._identifier_cache
+
+    @property
+    def sources(self) -> List[SyncSource]:
+        """동기화 대상 스프레드시트 목록 (처음 사용할 때 한 번만 불러옴)"""
+        with self._lock:
+            if self._sources is None:
+                self._sources = load_sync_sources()
+            return self._sources
+
+    def get_gs_manager(self, source: SyncSource) -> GoogleSheetsManager:
+        """
+        스프레드시트별 GoogleSheetsManager를 반환합니다.
+        서비스 계정 인증 정보는 첫 번째 인스턴스에서 한 번만 읽어 모든 스프레드시트가 공유합니다.
+        """
+        with self._lock:
+            if source.url not in self._gs_managers:
+                self._gs_managers[source.url] = GoogleSheetsManager(source.url, credentials=self._credentials,
+                                                                    api_limiter=self.api_limiter)
+                self._credentials = self._gs_managers[source.url].creds
+                self.logger.info(f"'{source.name}' Google Sheets/Drive 서비스를 생성했습니다.")
+            return self._gs_managers[source.url]
+
+    @property
+    def api_limiter(self) -> GoogleApiLimiter:
+        """모든 스프레드시트가 공유하는 Google API 쿼터 제한/재시도 실행기"""
+        return get_google_api_limiter()
+
+    @property
+    def notification_manager(self) -> NotificationManager:
+        """공유 NotificationManager"""
+        with self._lock:
+            if self._notification_manager is None:
+                self._notification_manager = NotificationManager()
+            return self._notification_manager
+
+    @property
+    def state_store(self) -> SyncStateStore:
+        """공유 동기화 상태 저장소"""
+        with self._lock:
+            if self._state_store is None:
+                self._state_store = SyncStateStore()
+            return self._state_store
+
+    def prepare_cycle(self) -> None:
+        """
+        동기화 주기 시작 전에 만료된 인증 정보만 갱신합니다. (인증 정보는 모든 스프레드시트가 공유)
+        Google API 사용량 집계도 이번 주기 기준으로 초기화합니다.
+        인증 정보는 처음으로 만들어진 GoogleSheetsManager로 갱신하고, 나머지는 read_source에서 필요할 때 만듭니다.
+        """
+        self.api_limiter.reset_usage()
+        for source in self.sources:
+            # 잘못된 URL 등으로 만들 수 없는 스프레드시트는 건너뜀 (read_source에서 스프레드시트별로 다시 오류를 기록)
+            try:
+                manager = self.get_gs_manager(source)
+            except Exception as e:
+                self.logger.error(f"[{source.name}] Google Sheets 서비스를 만들 수 없습니다: {e}")
+                continue
+            manager.ensure_fresh_credentials()
+            return
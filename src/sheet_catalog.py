@@ -0,0 +1,125 @@
+import re
+from datetime import date, timedelta
+from typing import Optional, List, Dict, Any
+
+# 시트 이름에서 날짜를 찾는 패턴 (위에서부터 우선 적용)
+_FULL_DATE_PATTERNS = [
+    re.compile(r'(?<!\d)(\d{4})[-.](\d{1,2})[-.](\d{1,2})(?!\d)'),    # 2025-07-17, 2025.07.17
+    re.compile(r'(?<!\d)(\d{4})(\d{2})(\d{2})(?!\d)'),                # 20250717
+]
+_MONTH_DAY_PATTERNS = [
+    re.compile(r'(\d{1,2})월\s*(\d{1,2})일'),                          # 7월17일, 7월 17일
+    re.compile(r'(?<!\d)(\d{1,2})[-.](\d{1,2})(?!\d)'),               # 07-17, 7.17
+    re.compile(r'(?<!\d)(\d{2})(\d{2})(?!\d)'),                       # 0717
+]
+
+# 연도가 없는 시트 이름은 기준일보다 이 기간 이상 미래이면 작년 날짜로 해석
+_FUTURE_TOLERANCE = timedelta(days=31)
+
+
+def parse_sheet_date(title: str, today: date) -> Optional[date]:
+    """
+    시트 이름에서 날짜를 파싱합니다. 연도가 없으면 기준일과 가장 가까운 연도로 해석합니다.
+
+    :param title: 시트 이름
+    :param today: 연도 추정 기준일
+    :return: 파싱된 날짜 또는 날짜가 없으면 None
+    """
+    for pattern in _FULL_DATE_PATTERNS:
+        for match in pattern.finditer(title):
+            try:
+                return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+            except ValueError:
+                continue
+
+    for pattern in _MONTH_DAY_PATTERNS:
+        for match in pattern.finditer(title):
+            try:
+                parsed = date(today.year, int(match.group(1)), int(match.group(2)))
+            except ValueError:
+                continue
+            if parsed > today + _FUTURE_TOLERANCE:
+                try:
+                    parsed = parsed.replace(year=today.year - 1)
+                except ValueError:
+                    continue
+            return parsed
+    return None
+
+
+class SheetCatalog:
+    """
+    스프레드시트의 시트 목록(gid, 행 수 등)과 시트 이름에서 파싱한 날짜를 보관하는 클래스
+
+    시트 이름은 만들 때 한 번만 파싱하고 날짜별 색인을 만들어 두므로,
+    "날짜 D의 시트"와 "기간 내 시트" 조회에 시트 수만큼 문자열 비교를 반복하지 않습니다.
+    """
+
+    def __init__(self, sheets: List[Dict[str, Any]], today: Optional[date] = None):
+        """
+        SheetCatalog를 초기화합니다.
+
+        :param sheets: {'title', 'sheet_id', 'index', 'row_count', 'column_count'} 딕셔너리 리스트 (시트 순서대로)
+        :param today: 연도가 없는 시트 이름의 연도 추정 기준일 (기본값: 오늘)
+        """
+        today = today or date.today()
+        self.sheets = sheets
+        self._by_title = {sheet['title']: sheet for sheet in sheets}
+        self._by_date: Dict[date, str] = {}
+        for sheet in sheets:
+            sheet_date = parse_sheet_date(sheet['title'], today)
+            # 같은 날짜의 시트가 여러 개면 앞쪽 시트를 사용
+            if sheet_date and sheet_date not in self._by_date:
+                self._by_date[sheet_date] = sheet['title']
+
+    @classmethod
+    def from_api_response(cls, spreadsheet: Dict[str, Any], today: Optional[date] = None) -> 'SheetCatalog':
+        """spreadsheets.get 응답으로 카탈로그를 만듭니다."""
+        sheets = []
+        for sheet in spreadsheet.get('sheets', []):
+            properties = sheet.get('properties', {})
+            grid = properties.get('gridProperties', {})
+            sheets.append({
+                'title': properties.get('title'),
+                'sheet_id': properties.get('sheetId'),
+                'index': properties.get('index'),
+                'row_count': grid.get('rowCount'),
+                'column_count': grid.get('columnCount')
+            })
+        return cls(sheets, today)
+
+    @classmethod
+    def from_titles(cls, titles: List[str], today: Optional[date] = None) -> 'SheetCatalog':
+        """시트 이름만으로 카탈로그를 만듭니다. (엑셀 파일에서 시트 목록을 얻은 경우)"""
+        return cls([{'title': title, 'sheet_id': None, 'index': i, 'row_count': None, 'column_count': None}
+                    for i, title in enumerate(titles)], today)
+
+    @property
+    def titles(self) -> List[str]:
+        """시트 이름 리스트 (순서대로)"""
+        return [sheet['title'] for sheet in self.sheets]
+
+    def get(self, title: str) -> Optional[Dict[str, Any]]:
+        """시트 이름으로 시트 정보를 조회합니다."""
+        return self._by_title.get(title)
+
+    def sheet_for_date(self, day: date) -> Optional[str]:
+        """해당 날짜의 시트 이름을 반환합니다."""
+        return self._by_date.get(day)
+
+    def sheets_in_range(self, start: date, end: date) -> List[str]:
+        """
+        기간 안에 있는 날짜 시트 이름들을 최신 날짜 순으로 반환합니다.
+
+        :param start: 시작일 (포함)
+        :param end: 종료일 (포함)
+        :return: 시트 이름 리스트
+        """
+        titles = []
+        day = end
+        while day >= start:
+            title = self._by_date.get(day)
+            if title:
+                titles.append(title)
+            day -= timedelta(days=1)
+        return titles
@@ -0,0 +1,365 @@
+import io
+import os
+import json
+import hashlib
+import logging
+import importlib.util
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Callable, Collection, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 시트 읽기 방식 기본값: auto (시트 크기와 워터마크에 따라 api/csv 자동 선택)
+DEFAULT_READER = 'auto'
+
+# auto 모드에서 전체를 다시 읽어야 하는 시트의 데이터 행 수(그리드 크기가 아닌 실제로 값이 있는 마지막 행)가
+# 이 값보다 크면 CSV 내보내기로 읽음
+DEFAULT_AUTO_CSV_ROWS = 5000
+
+
+def sheet_header(raw_header: List[Any], width: int) -> List[str]:
+    """
+    헤더 행을 컬럼 이름 리스트로 만듭니다.
+    pd.read_excel과 동일하게 빈 헤더는 'Unnamed: N', 중복 헤더는 '이름.1' 형태로 만듭니다.
+
+    :param raw_header: 헤더 행의 셀 값
+    :param width: 컬럼 수 (헤더 행보다 긴 데이터 행이 있으면 헤더 길이보다 큼)
+    :return: 컬럼 이름 리스트
+    """
+    header = []
+    seen = {}
+    for i in range(width):
+        cell = raw_header[i] if i < len(raw_header) else None
+        name = str(cell).strip() if cell is not None and cell != '' else f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        header.append(name)
+    return header
+
+
+def row_hash(row: List[Any]) -> str:
+    """워터마크 검증에 사용할 행 해시를 계산합니다. (API가 생략하는 끝의 빈 셀은 무시)"""
+    cells = [str(cell) for cell in row]
+    while cells and cells[-1] == '':
+        cells.pop()
+    return hashlib.sha1(json.dumps(cells, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def watermark_is_fresh(watermark: Optional[Dict[str, Any]], header_row: int, full_rescan_hours: float) -> bool:
+    """워터마크 이후의 행만 읽을 수 있는지 (워터마크가 있고 전체 스캔 주기가 지나지 않았는지) 확인합니다."""
+    if not watermark or watermark.get('row', 0) <= header_row + 1:
+        return False
+    full_scan_at = watermark.get('full_scan_at')
+    return bool(full_scan_at) and datetime.now() - datetime.fromisoformat(full_scan_at) < timedelta(hours=full_rescan_hours)
+
+
+def parse_csv(content: bytes, header_row: int = 0,
+              columns: Optional[Collection[str]] = None) -> Tuple[pd.DataFrame, Optional[Dict[str, Any]]]:
+    """
+    시트 하나를 CSV로 내보낸 내용을 DataFrame으로 변환합니다.
+    CSV 셀은 시트에 표시된 문자열(Sheets API의 FORMATTED_VALUE와 같음)이므로 모든 값을 문자열로 읽습니다.
+
+    :param content: CSV 내용 (UTF-8)
+    :param header_row: 헤더로 사용할 행의 위치 (0부터 시작)
+    :param columns: 이 컬럼들만 DataFrame으로 만듦 (없으면 전체 컬럼)
+    :return: (시트 행 번호를 인덱스로 하는 DataFrame, api 방식과 같은 형식의 새 워터마크)
+    """
+    # 행 번호가 시트와 맞도록 빈 줄도 행으로 읽고, 빈 셀만 null로 처리 ('NA' 등의 문자열은 그대로)
+    grid = pd.read_csv(io.BytesIO(content), header=None, dtype=object, keep_default_na=False, na_values=[''],
+                       skip_blank_lines=False, encoding='utf-8')
+
+    # 값이 있는 마지막 행까지만 사용 (API와 동일하게 끝의 빈 행은 시트 행으로 세지 않음)
+    filled = grid.notna().any(axis=1).to_numpy()
+    last_row = int(filled.nonzero()[0][-1]) + 1 if filled.any() else 0
+    if last_row <= header_row:
+        return pd.DataFrame(), None
+
+    header = sheet_header(grid.iloc[header_row].tolist(), grid.shape[1])
+    positions = range(len(header)) if columns is None else [i for i, name in enumerate(header) if name in columns]
+    df = grid.iloc[header_row + 1:last_row, list(positions)]
+    df.columns = [header[i] for i in positions]
+    first_data_row = header_row + 2  # 시트 행 번호 (1부터 시작)
+    df.index = range(first_data_row, first_data_row + len(df))
+
+    new_watermark = None
+    if last_row > header_row + 1:
+        last_values = ['' if pd.isna(cell) else cell for cell in grid.iloc[last_row - 1].tolist()]
+        new_watermark = {
+            'row': last_row,
+            'hash': row_hash(last_values),
+            'full_scan_at': datetime.now().isoformat()
+        }
+    return df, new_watermark
+
+
+def parse_xlsx_openpyxl(workbook: bytes, sheet_name: str, header_row: int = 0,
+                        columns: Optional[Collection[str]] = None,
+                        text_columns: Collection[str] = ()) -> pd.DataFrame:
+    """
+    엑셀 파일의 시트 하나를 openpyxl read_only 모드로 행 단위로 순회하며 필요한 컬럼만 DataFrame으로 만듭니다.
+    (워크북 전체를 셀 객체로 올리는 pd.read_excel 기본 엔진보다 메모리를 적게 쓰고 빠름)
+
+    :param workbook: 엑셀 파일 내용
+    :param sheet_name: 읽을 시트 이름
+    :param header_row: 헤더로 사용할 행의 위치 (0부터 시작)
+    :param columns: 이 컬럼들만 DataFrame으로 만듦 (없으면 전체 컬럼)
+    :param text_columns: 문자열로 읽을 컬럼 (숫자로 저장된 연락처의 앞자리 0 등을 보존)
+    :return: DataFrame
+    """
+    from openpyxl import load_workbook
+
+    book = load_workbook(io.BytesIO(workbook), read_only=True, data_only=True)
+    try:
+        rows = book[sheet_name].iter_rows(min_row=header_row + 1, values_only=True)
+        raw_header = next(rows, None)
+        if raw_header is None:
+            return pd.DataFrame()
+
+        header = sheet_header(list(raw_header), len(raw_header))
+        positions = range(len(header)) if columns is None else [i for i, name in enumerate(header) if name in columns]
+        text_positions = {i for i in positions if header[i] in text_columns}
+
+        records = []
+        for row in rows:
+            record = []
+            for i in positions:
+                value = row[i] if i < len(row) else None
+                if value == '':
+                    value = None
+                elif value is not None and i in text_positions:
+                    value = str(value)
+                record.append(value)
+            records.append(record)
+    finally:
+        book.close()
+
+    # pd.read_excel과 동일하게 끝의 빈 행은 제외
+    while records and all(value is None for value in records[-1]):
+        records.pop()
+    return pd.DataFrame(records, columns=[header[i] for i in positions])
+
+
+def parse_xlsx_calamine(workbook: bytes, sheet_name: str, header_row: int = 0,
+                        columns: Optional[Collection[str]] = None,
+                        text_columns: Collection[str] = ()) -> pd.DataFrame:
+    """
+    엑셀 파일의 시트 하나를 Rust로 구현된 calamine 엔진으로 읽습니다. (python-calamine 설치 및 pandas 2.2 이상 필요)
+
+    :return: DataFrame
+    """
+    return pd.read_excel(io.BytesIO(workbook), sheet_name=sheet_name, engine='calamine', skiprows=header_row,
+                         usecols=(lambda col: col in columns) if columns is not None else None,
+                         dtype={col: str for col in text_columns})
+
+
+def calamine_available() -> bool:
+    """calamine 엔진을 사용할 수 있는지 확인합니다."""
+    try:
+        major, minor = (int(part) for part in pd.__version__.split('.')[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= (2, 2) and importlib.util.find_spec('python_calamine') is not None
+
+
+class SheetReadRequest:
+    """시트 하나를 읽는 데 필요한 정보 (모든 읽기 방식이 같은 요청을 받음)"""
+
+    def __init__(self, sheet_name: str, header_row: int = 0, columns: Optional[Collection[str]] = None,
+                 text_columns: Collection[str] = (), sheet_info: Optional[Dict[str, Any]] = None,
+                 watermark: Optional[Dict[str, Any]] = None, full_rescan_hours: float = 24,
+                 load_workbook: Optional[Callable[[], Optional[bytes]]] = None):
+        """
+        SheetReadRequest를 초기화합니다.
+
+        :param sheet_name: 읽을 시트 이름
+        :param header_row: 헤더로 사용할 행의 위치 (0부터 시작)
+        :param columns: 이 컬럼들만 DataFrame으로 만듦 (없으면 전체 컬럼)
+        :param text_columns: 문자열로 읽을 컬럼 (엑셀 방식에서 사용)
+        :param sheet_info: 시트 카탈로그의 시트 정보 (sheet_id, row_count 등)
+        :param watermark: 이전 주기의 워터마크 (api 방식에서 신규 행만 읽을 때 사용)
+        :param full_rescan_hours: 전체 스캔 주기 (시간)
+        :param load_workbook: 엑셀 내보내기 내용을 반환하는 함수 (같은 스프레드시트의 시트들이 한 번 내보낸 파일을 공유)
+        """
+        self.sheet_name = sheet_name
+        self.header_row = header_row
+        self.columns = columns
+        self.text_columns = text_columns
+        self.sheet_info = sheet_info or {}
+        self.watermark = watermark
+        self.full_rescan_hours = full_rescan_hours
+        self.load_workbook = load_workbook
+        # 실제 데이터 범위 (마지막 행 번호): 이전 주기에 읽은 워터마크의 행, 없으면 read_sheet()가 첫 열을 조회해 채움
+        self.data_rows: Optional[int] = watermark.get('row') if watermark else None
+
+    @property
+    def sheet_id(self) -> Optional[int]:
+        """시트 gid (카탈로그를 엑셀 파일에서 만든 경우 None)"""
+        return self.sheet_info.get('sheet_id')
+
+    @property
+    def row_count(self) -> Optional[int]:
+        """시트 그리드의 행 수 (카탈로그의 gridProperties.rowCount, 빈 행 포함, 모르면 None)"""
+        return self.sheet_info.get('row_count')
+
+
+class SheetReader(ABC):
+    """시트 읽기 방식의 공통 인터페이스"""
+
+    name = ''
+
+    def available(self, request: SheetReadRequest) -> bool:
+        """이 요청을 이 방식으로 읽을 수 있는지 확인합니다."""
+        return True
+
+    @abstractmethod
+    def read(self, gs_manager, request: SheetReadRequest) -> Tuple[Optional[pd.DataFrame], Optional[Dict[str, Any]]]:
+        """
+        시트를 읽습니다.
+
+        :param gs_manager: GoogleSheetsManager
+        :param request: SheetReadRequest
+        :return: (DataFrame, 새 워터마크) 또는 실패 시 (None, None) - 워터마크를 만들지 않는 방식은 None
+        """
+
+
+class ApiSheetReader(SheetReader):
+    """Sheets API(values.batchGet)로 읽는 방식 - 워터마크가 있으면 이후에 추가된 행만 읽음"""
+
+    name = 'api'
+
+    def read(self, gs_manager, request):
+        return gs_manager.read_sheet_incremental(
+            request.sheet_name, header_row=request.header_row, watermark=request.watermark,
+            full_rescan_hours=request.full_rescan_hours, columns=request.columns
+        )
+
+
+class CsvExportSheetReader(SheetReader):
+    """시트 하나만 CSV로 내보내 읽는 방식 - 큰 시트 전체를 읽을 때 Sheets API 쿼터를 쓰지 않고 C 파서로 빠르게 파싱"""
+
+    name = 'csv'
+
+    def available(self, request):
+        return request.sheet_id is not None
+
+    def read(self, gs_manager, request):
+        content = gs_manager.export_sheet_csv(request.sheet_id)
+        if content is None:
+            return None, None
+        return parse_csv(content, request.header_row, request.columns)
+
+
+class ExcelSheetReader(SheetReader):
+    """전체 스프레드시트를 엑셀로 내보낸 뒤 시트 하나를 파싱하는 방식 (스프레드시트당 내보내기는 한 번)"""
+
+    parse = None
+
+    def read(self, gs_manager, request):
+        if request.load_workbook:
+            workbook = request.load_workbook()
+        else:
+            buffer = gs_manager.export_workbook()
+            workbook = buffer.getvalue() if buffer else None
+        if workbook is None:
+            return None, None
+        return self.parse(workbook, request.sheet_name, request.header_row, request.columns, request.text_columns), None
+
+
+class OpenpyxlSheetReader(ExcelSheetReader):
+    """openpyxl read_only 모드로 행 단위로 읽는 방식"""
+
+    name = 'openpyxl'
+    parse = staticmethod(parse_xlsx_openpyxl)
+
+
+class CalamineSheetReader(ExcelSheetReader):
+    """calamine 엔진으로 읽는 방식 (설치된 경우에만 사용)"""
+
+    name = 'calamine'
+    parse = staticmethod(parse_xlsx_calamine)
+
+    def available(self, request):
+        return calamine_available()
+
+
+READERS: Dict[str, SheetReader] = {reader.name: reader for reader in (
+    ApiSheetReader(), CsvExportSheetReader(), OpenpyxlSheetReader(), CalamineSheetReader()
+)}
+
+
+def excel_reader_name() -> str:
+    """엑셀 방식 중 사용할 엔진 이름을 반환합니다. (calamine이 있으면 calamine, 없으면 openpyxl)"""
+    return 'calamine' if calamine_available() else 'openpyxl'
+
+
+def reader_order(mode: str, request: SheetReadRequest, auto_csv_rows: Optional[int] = None) -> List[str]:
+    """
+    시도할 읽기 방식 순서를 반환합니다. 앞의 방식이 실패하면 다음 방식으로 읽습니다.
+
+    auto 모드에서는 워터마크 이후의 행만 읽을 수 있거나 작은 시트이면 api,
+    전체를 다시 읽어야 하는 큰 시트(request.data_rows 기준)이면 CSV 내보내기를 먼저 사용합니다.
+    마지막 대안은 항상 엑셀 내보내기입니다.
+
+    :param mode: auto, api, csv, xlsx(설치된 엑셀 엔진), openpyxl, calamine
+    :param request: SheetReadRequest
+    :param auto_csv_rows: auto 모드의 CSV 전환 기준 행 수 (기본값: 환경변수 SHEETS_READER_AUTO_CSV_ROWS 또는 5000)
+    :return: 읽기 방식 이름 리스트
+    """
+    excel = excel_reader_name()
+    if mode == 'auto':
+        auto_csv_rows = auto_csv_rows if auto_csv_rows is not None else int(
+            os.getenv('SHEETS_READER_AUTO_CSV_ROWS', str(DEFAULT_AUTO_CSV_ROWS)))
+        large = request.data_rows is not None and request.data_rows > auto_csv_rows
+        incremental = watermark_is_fresh(request.watermark, request.header_row, request.full_rescan_hours)
+        order = ['csv', 'api'] if large and not incremental else ['api', 'csv']
+    elif mode == 'api':
+        order = ['api']
+    elif mode == 'csv':
+        order = ['csv', 'api']
+    elif mode in ('xlsx', 'openpyxl', 'calamine'):
+        order = [excel if mode == 'xlsx' else mode]
+    else:
+        raise ValueError(f"알 수 없는 시트 읽기 방식입니다: {mode} (사용 가능: auto, xlsx, {', '.join(READERS)})")
+
+    order.append(excel)
+    if excel != 'openpyxl':
+        order.append('openpyxl')
+    # 중복과 이 요청에 사용할 수 없는 방식 제외
+    names = []
+    for name in order:
+        if name not in names and READERS[name].available(request):
+            names.append(name)
+    return names
+
+
+def read_sheet(gs_manager, request: SheetReadRequest,
+               mode: Optional[str] = None) -> Tuple[Optional[pd.DataFrame], Optional[Dict[str, Any]], Optional[str]]:
+    """
+    선택된 방식으로 시트를 읽고, 실패하면 다음 방식으로 읽습니다.
+
+    :param gs_manager: GoogleSheetsManager
+    :param request: SheetReadRequest
+    :param mode: 읽기 방식 (기본값: 환경변수 SHEETS_INGESTION_MODE 또는 auto)
+    :return: (DataFrame, 새 워터마크, 사용한 방식 이름) 또는 모두 실패하면 (None, None, None)
+    """
+    mode = (mode or os.getenv('SHEETS_INGESTION_MODE', DEFAULT_READER)).lower()
+    if (mode == 'auto' and request.data_rows is None and READERS['csv'].available(request)
+            and not watermark_is_fresh(request.watermark, request.header_row, request.full_rescan_hours)):
+        # 그리드 행 수는 빈 행까지 포함하므로 전체를 읽기 전에 첫 열만 조회해 실제 데이터 범위로 판단
+        request.data_rows = gs_manager.count_data_rows(request.sheet_name)
+    for name in reader_order(mode, request):
+        try:
+            df, new_watermark = READERS[name].read(gs_manager, request)
+        except Exception as e:
+            logger.warning(f"'{name}' 방식으로 시트 '{request.sheet_name}'를 읽는 중 오류 발생: {e}")
+            df, new_watermark = None, None
+        if df is not None:
+            return df, new_watermark, name
+        logger.warning(f"'{name}' 방식으로 시트 '{request.sheet_name}'를 읽지 못해 다음 방식으로 전환합니다.")
+    return None, None, None
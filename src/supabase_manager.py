@@ -1,84 +1,455 @@
+import os
+import json
+import math
+import time
+import random
 import logging
-from typing import List, Dict, Any, Set, Tuple
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .identity import IdentifierIndex, IdentifierIndexBuilder
+from .identifier_cache import IdentifierCache
+
+# keyset 페이지 조회와 로컬 식별자 캐시의 high-water mark에 사용하는 컬럼 (customer_inquiries의 증가하는 기본 키)
+ID_COLUMN = 'id'
+
+# 모든 inquiry_type 뷰(estimates, consultations 등)의 기반 테이블: 기존 식별자는 이 테이블에서 inquiry_type별로 한 번에 조회
+IDENTIFIER_TABLE = 'customer_inquiries'
+INQUIRY_TYPE_COLUMN = 'inquiry_type'
+
+# 삽입 방식: insert (기존 식별자를 조회해 클라이언트에서 중복 제거 후 삽입),
+# upsert (유니크 키 충돌 무시 upsert), rpc (중복을 무시하고 삽입된 행만 반환하는 함수 호출)
+# upsert/rpc는 supabase/migrations의 유니크 인덱스와 함수가 필요
+WRITE_MODES = ('insert', 'upsert', 'rpc')
+IDENTITY_CONFLICT_COLUMNS = 'inquiry_type,name,phone'
+INSERT_IGNORE_DUPLICATES_FUNCTION = 'insert_customer_inquiries_ignore_duplicates'
+
+# 재시도할 오류: HTTP 상태 코드 (PostgREST가 JSON이 아닌 오류 응답을 받으면 code에 상태 코드를 넣음)와
+# 일시적인 PostgreSQL 오류 (직렬화 실패, 교착 상태, 문장 시간 초과, 연결 수 초과)
+TRANSIENT_ERROR_CODES = {'408', '429', '500', '502', '503', '504', '40001', '40P01', '57014', '53300'}
+UNIQUE_VIOLATION_CODE = '23505'
+
+
+def to_json_safe(value: Any) -> Any:
+    """
+    시트에서 읽은 값을 JSON으로 보낼 수 있는 값으로 변환합니다.
+    NaN/NaT/inf는 None, Timestamp/datetime/date는 ISO 문자열, NumPy 스칼라는 Python 값으로 바꿉니다.
+    """
+    if value is None or isinstance(value, (str, bool, int)):
+        return value
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, np.generic):
+        return to_json_safe(value.item())
+    if isinstance(value, dict):
+        return {key: to_json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_safe(item) for item in value]
+    if pd.isna(value):
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    """PostgREST APIError의 code를 반환합니다."""
+    code = getattr(error, 'code', None)
+    return str(code) if code is not None else None
+
+
+def is_transient_error(error: Exception) -> bool:
+    """재시도하면 성공할 수 있는 오류인지 판단합니다. (네트워크 오류, 5xx/429, 일시적인 DB 오류)"""
+    if _error_code(error) in TRANSIENT_ERROR_CODES:
+        return True
+    # httpx의 연결/시간 초과 오류 (httpx를 직접 import하지 않고 이름으로 확인)
+    return isinstance(error, (ConnectionError, TimeoutError)) or any(
+        cls.__name__ in ('TransportError', 'TimeoutException') for cls in type(error).__mro__)
+
+
+def is_unique_violation(error: Exception) -> bool:
+    """유니크 키 충돌 오류인지 판단합니다. (insert 방식에서 이미 있는 행)"""
+    return _error_code(error) == UNIQUE_VIOLATION_CODE
+
+
+def identity_key(record: Dict[str, Any]) -> Tuple[str, str, str]:
+    """중복 판단 키 (inquiry_type, name, phone)를 반환합니다."""
+    return tuple(str(record.get(col)) for col in IDENTITY_CONFLICT_COLUMNS.split(','))
+
+
+class WriteResult:
+    """
+    write_customer_inquiries()의 레코드별 결과와 DB가 반환한 행
+
+    상태는 inserted, duplicate, failed, unknown(insert 방식에서 요청은 반영됐지만 응답 행 수가 달라 삽입 여부를
+    확인할 수 없는 레코드, 중복 삽입을 막기 위해 다시 보내지 않음) 중 하나입니다.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self.records = records
+        self.statuses: List[Optional[str]] = [None] * len(records)
+        self.errors: List[Optional[str]] = [None] * len(records)
+        # 실패한 레코드가 일시적 오류(재시도 횟수 초과)로 실패했는지 여부 (False면 데이터 오류 등 영구 실패)
+        self.transient: List[bool] = [False] * len(records)
+        self.rows: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def set(self, index: int, status: str, error: Optional[str] = None, transient: bool = False) -> None:
+        self.statuses[index] = status
+        self.errors[index] = error
+        self.transient[index] = transient
+
+    def add_rows(self, rows: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self.rows.extend(rows)
+
+    def count(self, status: str) -> int:
+        return sum(1 for value in self.statuses if value == status)
+
+    @property
+    def inserted_records(self) -> List[Dict[str, Any]]:
+        """실제로 삽입된 입력 레코드 (입력 순서)"""
+        return [record for record, status in zip(self.records, self.statuses) if status == 'inserted']
+
+    @property
+    def failed(self) -> List[Tuple[Dict[str, Any], str]]:
+        """삽입에 실패한 (입력 레코드, 오류 메시지) 리스트"""
+        return [(record, error) for record, status, error in zip(self.records, self.statuses, self.errors)
+                if status == 'failed']
+
+    @property
+    def retryable_failed(self) -> List[Tuple[Dict[str, Any], str]]:
+        """일시적 오류로 재시도 횟수를 넘겨 실패한 (입력 레코드, 오류 메시지) 리스트 (다음 주기에 다시 시도)"""
+        return [(record, error) for record, status, error, transient
+                in zip(self.records, self.statuses, self.errors, self.transient) if status == 'failed' and transient]
+
+    @property
+    def permanently_failed(self) -> List[Tuple[Dict[str, Any], str]]:
+        """데이터 오류 등으로 다시 보내도 실패할 (입력 레코드, 오류 메시지) 리스트"""
+        return [(record, error) for record, status, error, transient
+                in zip(self.records, self.statuses, self.errors, self.transient) if status == 'failed' and not transient]
+
 
 class SupabaseManager:
     """Supabase 데이터베이스 관련 작업을 관리하는 클래스"""
 
-    def __init__(self, supabase_client):
+    def __init__(self, supabase_client, identifier_cache: Optional[IdentifierCache] = None,
+                 write_mode: Optional[str] = None):
         """
         SupabaseManager를 초기화합니다.
 
         :param supabase_client: Supabase 클라이언트 인스턴스
+        :param identifier_cache: 기존 식별자를 보관할 로컬 캐시 (없으면 매번 뷰 전체를 조회)
+        :param write_mode: 삽입 방식 insert, upsert, rpc (기본값: 환경변수 SUPABASE_WRITE_MODE 또는 insert)
         """
         self.client = supabase_client
+        self.identifier_cache = identifier_cache
         self.logger = logging.getLogger(__name__)
+        # keyset 페이지 크기 (PostgREST max-rows 이하 권장), 동시에 가져올 id 범위 수
+        self.page_size = int(os.getenv('SUPABASE_PAGE_SIZE', '1000'))
+        self.fetch_workers = int(os.getenv('SUPABASE_FETCH_WORKERS', '4'))
+        # 삽입 묶음 크기(행 수, 요청 바이트), 동시에 보낼 묶음 수, 일시적 오류 재시도 (지수 백오프, 초 단위)
+        self.insert_chunk_size = int(os.getenv('SUPABASE_INSERT_CHUNK_SIZE', '500'))
+        self.insert_chunk_bytes = int(os.getenv('SUPABASE_INSERT_CHUNK_BYTES', str(1024 * 1024)))
+        self.insert_workers = int(os.getenv('SUPABASE_INSERT_WORKERS', '4'))
+        self.insert_max_retries = int(os.getenv('SUPABASE_INSERT_MAX_RETRIES', '4'))
+        self.insert_backoff_base = float(os.getenv('SUPABASE_INSERT_BACKOFF_BASE', '0.5'))
+        self.insert_backoff_max = float(os.getenv('SUPABASE_INSERT_BACKOFF_MAX', '30'))
+        self.write_mode = (write_mode or os.getenv('SUPABASE_WRITE_MODE', 'insert')).lower()
+        if self.write_mode not in WRITE_MODES:
+            raise ValueError(f"알 수 없는 삽입 방식입니다: {self.write_mode} (사용 가능: {', '.join(WRITE_MODES)})")
+
+    @property
+    def server_side_dedupe(self) -> bool:
+        """DB가 중복을 걸러내는 삽입 방식인지 여부 (True면 기존 식별자를 미리 조회할 필요 없음)"""
+        return self.write_mode != 'insert'
+
+    def _id_bounds(self, view_name: str, after_id: Optional[int] = None) -> Optional[Tuple[Any, Any]]:
+        """뷰에서 (after_id 이후) 가장 작은 id와 가장 큰 id를 조회합니다. 행이 없으면 None을 반환합니다."""
+        def edge(desc: bool):
+            query = self.client.table(view_name).select(ID_COLUMN)
+            if after_id is not None:
+                query = query.gt(ID_COLUMN, after_id)
+            data = query.order(ID_COLUMN, desc=desc).limit(1).execute().data
+            return data[0][ID_COLUMN] if data else None
+
+        low = edge(False)
+        if low is None:
+            return None
+        return low, edge(True)
+
+    def _fetch_id_range(self, view_name: str, columns: str, low: Any, high: Any,
+                        on_page: Callable[[List[Dict[str, Any]]], None]) -> int:
+        """
+        [low, high] 범위의 행을 id 순서의 keyset 페이지로 가져와 페이지마다 on_page를 호출합니다.
+        (offset 없이 마지막 id 이후를 조회하므로 페이지가 뒤로 가도 느려지지 않음)
+
+        :return: 가져온 행 수
+        """
+        count = 0
+        last = None
+        while True:
+            query = self.client.table(view_name).select(columns).lte(ID_COLUMN, high)
+            query = query.gte(ID_COLUMN, low) if last is None else query.gt(ID_COLUMN, last)
+            rows = query.order(ID_COLUMN).limit(self.page_size).execute().data
+            # 서버의 최대 행 수(max-rows)가 page_size보다 작아도 잘리지 않도록 빈 페이지가 나올 때까지 조회
+            if not rows:
+                return count
+            on_page(rows)
+            count += len(rows)
+            last = rows[-1][ID_COLUMN]
+
+    def fetch_rows(self, view_name: str, columns: List[str], on_page: Callable[[List[Dict[str, Any]]], None],
+                   after_id: Optional[int] = None) -> Tuple[int, Optional[Any]]:
+        """
+        뷰의 행을 id 기준 keyset 페이지로 모두 가져옵니다. PostgREST의 최대 행 수 제한에 잘리지 않으며,
+        id 범위를 나눠 여러 페이지 흐름을 동시에 가져옵니다. 응답을 모아 두지 않고 페이지마다 on_page로 넘깁니다.
+
+        :param view_name: 조회할 뷰 이름
+        :param columns: 가져올 컬럼 (id는 자동으로 포함)
+        :param on_page: 페이지(행 딕셔너리 리스트)를 받는 함수 (여러 스레드에서 동시에 호출될 수 있음)
+        :param after_id: 이 id 이후의 행만 가져옴 (없으면 전체)
+        :return: (가져온 행 수, 조회 시점의 가장 큰 id - 행이 없으면 None)
+        """
+        bounds = self._id_bounds(view_name, after_id)
+        if bounds is None:
+            return 0, None
+        low, high = bounds
+        select = ','.join([ID_COLUMN] + [col for col in columns if col != ID_COLUMN])
+
+        # 정수 id는 범위를 나눠 동시에 가져옴 (범위가 겹치지 않으므로 각 범위의 keyset 순서가 그대로 유지됨)
+        ranges = [(low, high)]
+        if isinstance(low, int) and isinstance(high, int):
+            span = high - low + 1
+            shards = max(1, min(self.fetch_workers, -(-span // self.page_size)))
+            step = -(-span // shards)
+            ranges = [(start, min(start + step - 1, high)) for start in range(low, high + 1, step)]
+
+        if len(ranges) == 1:
+            count = self._fetch_id_range(view_name, select, low, high, on_page)
+        else:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                count = sum(executor.map(lambda bound: self._fetch_id_range(view_name, select, bound[0], bound[1], on_page),
+                                         ranges))
+        return count, high
 
-    def get_existing_identifiers(self, view_name: str, identifier_columns: list) -> set:
+    @staticmethod
+    def _group_by_type(rows: List[Dict[str, Any]]) -> Dict[str, Tuple[List[Any], List[Any]]]:
         """
-        지정된 뷰에서 기존 데이터의 고유 식별자를 가져옵니다.
-        
-        Args:
-            view_name: 조회할 뷰 이름
-            identifier_columns: 고유 식별자로 사용할 컬럼 리스트
-            
-        Returns:
-            (name, phone) 튜플의 집합
+        행을 저장된 inquiry_type별 (이름 리스트, 연락처 리스트)로 나눕니다.
+        (inquiry_type은 시트의 '문의' 값으로 바뀔 수 있으므로 identity_key와 같이 문자열로 비교)
         """
+        groups: Dict[str, Tuple[List[Any], List[Any]]] = {}
+        for row in rows:
+            names, phones = groups.setdefault(str(row.get(INQUIRY_TYPE_COLUMN)), ([], []))
+            names.append(row.get('name'))
+            phones.append(row.get('phone'))
+        return groups
+
+    def get_existing_identifiers(self) -> Optional[Dict[str, IdentifierIndex]]:
+        """
+        기반 테이블(customer_inquiries)에서 기존 식별자를 한 번의 조회로 가져와 저장된 inquiry_type별로 나눕니다.
+        inquiry_type은 시트의 '문의' 값으로 바뀌어 설정된 타입 외의 값으로 저장될 수 있으므로 타입 조건 없이 모두 가져옵니다.
+        행 수와 상관없이 모든 행을 keyset 페이지로 가져와 페이지마다 바로 inquiry_type별 해시 색인에 쌓습니다.
+
+        :return: 저장된 inquiry_type -> 정규화된 (name, phone) 식별자의 해시 색인 (시트 데이터와 같은 규칙으로 정규화하여 비교),
+                 조회에 실패하면 None (빈 색인으로 비교하면 모든 행이 신규로 보여 다시 삽입되므로 구분)
+        """
+        if self.identifier_cache is not None:
+            try:
+                return self._refresh_cached_identifiers()
+            except Exception as e:
+                self.logger.warning(f"로컬 식별자 캐시 갱신 실패, '{IDENTIFIER_TABLE}' 전체를 조회합니다: {e}")
+
         try:
-            # careon_applications는 phone_number를 사용하고, 나머지는 phone를 사용
-            if view_name == 'careon_applications':
-                response = self.client.table(view_name).select(','.join(identifier_columns)).execute()
-                existing_identifiers = set()
-                
-                for row in response.data:
-                    name = row.get('name')
-                    phone = row.get('phone_number')
-                    if name and phone:
-                        existing_identifiers.add((str(name), str(phone)))
-            else:
-                # identifier_columns에서 phone_number를 phone으로 변경
-                db_columns = []
-                for col in identifier_columns:
-                    if col == 'phone_number':
-                        db_columns.append('phone')
-                    else:
-                        db_columns.append(col)
-                
-                response = self.client.table(view_name).select(','.join(db_columns)).execute()
-                existing_identifiers = set()
-                
-                for row in response.data:
-                    name = row.get('name')
-                    phone = row.get('phone')
-                    if name and phone:
-                        existing_identifiers.add((str(name), str(phone)))
-                    
-            return existing_identifiers
+            # 하이픈, +82, 이름 앞뒤 공백 등 표기가 달라도 같은 식별자로 비교되도록 정규화
+            builders: Dict[str, IdentifierIndexBuilder] = {}
+            lock = threading.Lock()
+
+            def add_page(rows):
+                for inquiry_type, (names, phones) in self._group_by_type(rows).items():
+                    with lock:
+                        builder = builders.setdefault(inquiry_type, IdentifierIndexBuilder())
+                    builder.add(names, phones)
+
+            count, _ = self.fetch_rows(IDENTIFIER_TABLE, [INQUIRY_TYPE_COLUMN, 'name', 'phone'], add_page)
+            self.logger.info(f"'{IDENTIFIER_TABLE}'에서 {len(builders)}개 inquiry_type의 행 {count}개를 조회했습니다.")
+            return {inquiry_type: builder.build() for inquiry_type, builder in builders.items()}
         except Exception as e:
-            self.logger.error(f"'{view_name}' 뷰에서 기존 식별자 조회 실패: {e}")
-            return set()
+            self.logger.error(f"'{IDENTIFIER_TABLE}'에서 기존 식별자 조회 실패: {e}")
+            return None
 
-    def insert_customer_inquiries(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _refresh_cached_identifiers(self) -> Dict[str, IdentifierIndex]:
+        """
+        로컬 캐시를 갱신한 뒤 캐시로 저장된 inquiry_type별 식별자 색인을 만듭니다.
+        high-water mark 이후의 행만 가져오고, 전체 재조회 주기가 지났으면 전체를 가져와 캐시를 교체합니다.
+        식별자는 '테이블:inquiry_type' 키로, high-water mark는 테이블 키로 기록합니다.
         """
-        'customer_inquiries' 테이블에 여러 레코드를 한 번에 삽입합니다.
+        cache = self.identifier_cache
+        prefix = f"{IDENTIFIER_TABLE}:"
+        columns = [INQUIRY_TYPE_COLUMN, 'name', 'phone']
 
-        :param records: 삽입할 레코드 딕셔너리의 리스트
-        :return: 삽입에 성공한 레코드 리스트
+        def add_page(rows):
+            for inquiry_type, (names, phones) in self._group_by_type(rows).items():
+                cache.add(prefix + inquiry_type, names, phones)
+
+        if cache.needs_full_sync(IDENTIFIER_TABLE):
+            # 비운 뒤 페이지마다 추가하고 마지막에 완료를 기록 (중간에 실패하면 다음 조회에서 다시 전체를 가져옴)
+            for key in [IDENTIFIER_TABLE] + cache.views(prefix):
+                cache.clear(key)
+            count, high_water = self.fetch_rows(IDENTIFIER_TABLE, columns, add_page)
+            cache.mark_full_sync(IDENTIFIER_TABLE, high_water)
+            self.logger.info(f"'{IDENTIFIER_TABLE}' 전체({count}개)를 조회해 로컬 식별자 캐시를 교체했습니다.")
+        else:
+            count, high_water = self.fetch_rows(IDENTIFIER_TABLE, columns, add_page,
+                                                after_id=cache.high_water(IDENTIFIER_TABLE))
+            if high_water is not None:
+                cache.advance_high_water(IDENTIFIER_TABLE, high_water)
+            self.logger.info(f"'{IDENTIFIER_TABLE}'에서 {count}개의 신규 행을 가져와 로컬 식별자 캐시에 추가했습니다.")
+        return {key[len(prefix):]: cache.load(key) for key in cache.views(prefix)}
+
+    def cache_inserted(self, records: List[Dict[str, Any]]) -> None:
         """
-        if not records:
-            return []
-        
+        삽입한 레코드의 식별자를 로컬 캐시에 바로 추가합니다. (다음 주기에 다시 내려받기 전에도 중복으로 인식)
+
+        :param records: 삽입에 성공한 레코드 리스트 (customer_inquiries의 inquiry_type, name, phone 컬럼)
+        """
+        if self.identifier_cache is None or not records:
+            return
         try:
-            response = self.client.table('customer_inquiries').insert(records).execute()
-            if len(response.data) > 0:
-                self.logger.info(f"{len(records)}개의 신규 문의를 'customer_inquiries'에 성공적으로 삽입했습니다.")
-                return response.data
-            else:
-                self.logger.error(f"데이터 삽입 실패 (No data returned): {response}")
-                return []
+            for inquiry_type, (names, phones) in self._group_by_type(records).items():
+                self.identifier_cache.add(f"{IDENTIFIER_TABLE}:{inquiry_type}", names, phones)
         except Exception as e:
-            self.logger.error(f"'customer_inquiries'에 데이터 삽입 실패: {e}")
-            return []
+            self.logger.warning(f"삽입한 레코드를 로컬 식별자 캐시에 추가하지 못했습니다: {e}")
+
+    def _send_chunk(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """레코드 묶음 하나를 설정된 삽입 방식으로 보내고 DB가 반환한 행을 반환합니다. (응답 행 수는 호출한 쪽에서 확인)"""
+        if self.write_mode == 'rpc':
+            request = self.client.rpc(INSERT_IGNORE_DUPLICATES_FUNCTION, {'records': chunk})
+        elif self.write_mode == 'upsert':
+            request = self.client.table('customer_inquiries').upsert(
+                chunk, on_conflict=IDENTITY_CONFLICT_COLUMNS, ignore_duplicates=True
+            )
+        else:
+            request = self.client.table('customer_inquiries').insert(chunk)
+        return request.execute().data or []
+
+    def _send_with_retry(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        일시적 오류(네트워크, 5xx/429, 교착 상태 등)는 지터를 섞은 지수 백오프로 재시도합니다.
+        insert 방식은 시간 초과 등으로 실패해도 이미 반영됐을 수 있어 다시 보내면 중복 삽입되므로 재시도하지 않습니다.
+        (유니크 인덱스로 중복을 걸러내는 upsert/rpc 방식만 재시도)
+        """
+        attempt = 0
+        while True:
+            try:
+                return self._send_chunk(chunk)
+            except Exception as e:
+                attempt += 1
+                if not self.server_side_dedupe or not is_transient_error(e) or attempt > self.insert_max_retries:
+                    raise
+                delay = random.uniform(0, min(self.insert_backoff_max, self.insert_backoff_base * (2 ** attempt)))
+                self.logger.warning(f"Supabase 일시적 오류로 {len(chunk)}개 레코드 삽입을 {delay:.1f}초 후 재시도합니다... "
+                                    f"({attempt}/{self.insert_max_retries}): {e}")
+                time.sleep(delay)
+
+    def _write_chunk(self, result: 'WriteResult', indices: List[int], payloads: List[Dict[str, Any]]) -> None:
+        """
+        레코드 묶음을 삽입하고 행별 결과를 기록합니다.
+        upsert/rpc 방식은 데이터 오류로 실패하면 묶음을 반으로 나눠 다시 시도해 문제가 있는 행만 실패로 남깁니다.
+        insert 방식은 다시 보내지 않고 묶음 전체를 실패로 기록합니다. (일시적 오류면 다음 주기에 기존 식별자와
+        다시 비교한 뒤 삽입)
+        """
+        try:
+            rows = self._send_with_retry([payloads[i] for i in indices])
+        except Exception as e:
+            if self.server_side_dedupe and len(indices) > 1 and not is_transient_error(e):
+                middle = len(indices) // 2
+                self._write_chunk(result, indices[:middle], payloads)
+                self._write_chunk(result, indices[middle:], payloads)
+                return
+            status = 'duplicate' if is_unique_violation(e) else 'failed'
+            transient = is_transient_error(e)
+            for i in indices:
+                result.set(i, status, None if status == 'duplicate' else str(e), transient)
+            if status == 'failed':
+                self.logger.error(f"'customer_inquiries'에 {len(indices)}개 레코드 삽입 실패: {e}")
+            return
+
+        result.add_rows(rows)
+        if self.write_mode == 'insert':
+            if len(rows) == len(indices):
+                for i in indices:
+                    result.set(i, 'inserted')
+                return
+            # 요청은 반영됐지만 응답 행 수가 다르면 반환된 행만 삽입으로 보고 나머지는 확인 불가로 남김 (다시 보내지 않음)
+            self.logger.warning(f"삽입 응답의 행 수가 다릅니다 (요청 {len(indices)}개, 응답 {len(rows)}개). "
+                                f"반환되지 않은 레코드는 다시 보내지 않습니다.")
+            returned_keys = {identity_key(row) for row in rows}
+            for i in indices:
+                result.set(i, 'inserted' if identity_key(payloads[i]) in returned_keys else 'unknown')
+        else:
+            # upsert/rpc는 실제로 삽입된 행만 반환하므로 반환되지 않은 레코드는 DB가 건너뛴 중복
+            inserted_keys = {identity_key(row) for row in rows}
+            for i in indices:
+                result.set(i, 'inserted' if identity_key(payloads[i]) in inserted_keys else 'duplicate')
+
+    def _chunk_indices(self, payloads: List[Dict[str, Any]]) -> List[List[int]]:
+        """레코드를 행 수(SUPABASE_INSERT_CHUNK_SIZE)와 요청 크기(SUPABASE_INSERT_CHUNK_BYTES) 이하의 묶음으로 나눕니다."""
+        chunks, current, current_bytes = [], [], 0
+        for i, payload in enumerate(payloads):
+            size = len(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+            if current and (len(current) >= self.insert_chunk_size or current_bytes + size > self.insert_chunk_bytes):
+                chunks.append(current)
+                current, current_bytes = [], 0
+            current.append(i)
+            current_bytes += size
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def write_customer_inquiries(self, records: List[Dict[str, Any]]) -> 'WriteResult':
+        """
+        'customer_inquiries'에 레코드를 설정된 삽입 방식(insert/upsert/rpc)으로 삽입하고 행별 결과를 반환합니다.
+
+        레코드는 JSON으로 보낼 수 있는 값으로 변환한 뒤 크기 제한이 있는 묶음으로 나눠 동시에 보냅니다.
+        upsert/rpc 방식은 일시적 오류를 재시도하고, 데이터 오류로 실패한 묶음은 반씩 나눠 다시 보내므로 문제가 있는
+        행 때문에 나머지 행을 잃지 않습니다. insert 방식은 중복 삽입을 막기 위해 같은 요청을 다시 보내지 않습니다.
+
+        :param records: 삽입할 레코드 딕셔너리의 리스트
+        :return: WriteResult (레코드별 inserted/duplicate/failed/unknown 상태, DB가 반환한 행)
+        """
+        result = WriteResult(records)
+        if not records:
+            return result
+
+        payloads = [{key: to_json_safe(value) for key, value in record.items()} for record in records]
+        chunks = self._chunk_indices(payloads)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.insert_workers, len(chunks)))) as executor:
+            list(executor.map(lambda indices: self._write_chunk(result, indices, payloads), chunks))
+
+        log = self.logger.error if result.failed else self.logger.info
+        log(f"'customer_inquiries' 삽입 결과 ({self.write_mode}, {len(chunks)}개 묶음): "
+            f"신규 {len(result.inserted_records)}개, 중복 {result.count('duplicate')}개, 실패 {len(result.failed)}개, "
+            f"확인 불가 {result.count('unknown')}개")
+        return result
+
+    def insert_customer_inquiries(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        'customer_inquiries' 테이블에 여러 레코드를 삽입합니다. (write_customer_inquiries 참고)
+
+        :param records: 삽입할 레코드 딕셔너리의 리스트
+        :return: 삽입에 성공한 레코드 리스트 (DB가 반환한 행)
+        """
+        return self.write_customer_inquiries(records).rows
 
     def log_sync_status(self, sheet_name: str, status: str, count: int = 0, error_message: str = None):
         """
@@ -0,0 +1,97 @@
+import os
+import json
+import logging
+from typing import Optional, List, Dict, Any
+
+from .column_mappings import get_column_mapping_config
+
+logger = logging.getLogger(__name__)
+
+
+class SyncSource:
+    """동기화 대상 스프레드시트 하나와 그 시트 선택/컬럼 매핑 규칙을 나타내는 클래스"""
+
+    def __init__(self, url: str, name: Optional[str] = None, sheet_name: Optional[str] = None,
+                 header_rows: Optional[Dict[str, int]] = None, default_header_row: Optional[int] = None,
+                 column_mappings: Optional[Dict[str, Dict[str, Any]]] = None,
+                 inquiry_types: Optional[List[str]] = None, date_window_days: Optional[int] = None,
+                 reader: Optional[str] = None):
+        """
+        SyncSource를 초기화합니다.
+
+        :param url: Google Sheets URL
+        :param name: 로그/알림에 표시할 이름 (기본값: URL)
+        :param sheet_name: 항상 이 시트를 사용 (없으면 최근 날짜와 매칭되는 시트들을 선택)
+        :param header_rows: {시트이름: 헤더 행 위치} 예외 규칙 (없으면 컬럼 매핑 설정의 header_rows)
+        :param default_header_row: 헤더 행 위치 기본값 (0부터 시작, 없으면 컬럼 매핑 설정의 기본값)
+        :param column_mappings: inquiry_type별 컬럼 매핑 덮어쓰기 규칙
+        :param inquiry_types: 처리할 inquiry_type 목록 (없으면 전체)
+        :param date_window_days: 오늘부터 며칠 전까지의 날짜 시트를 처리할지 (없으면 SHEET_DATE_WINDOW_DAYS)
+        :param reader: 시트 읽기 방식 (auto, api, csv, xlsx, openpyxl, calamine - 없으면 SHEETS_INGESTION_MODE)
+        """
+        self.url = url
+        self.name = name or url
+        self.sheet_name = sheet_name
+        self.header_rows = header_rows or {}
+        self.default_header_row = default_header_row
+        self.column_mappings = column_mappings or {}
+        self.inquiry_types = inquiry_types
+        self.date_window_days = date_window_days
+        self.reader = reader
+
+    def get_header_row(self, sheet_name: str) -> int:
+        """시트별 헤더 행 위치를 반환합니다. (스프레드시트별 규칙 -> 설정 파일의 시트별 규칙 -> 기본값 순)"""
+        if sheet_name in self.header_rows:
+            return self.header_rows[sheet_name]
+        mapping_config = get_column_mapping_config()
+        if sheet_name in mapping_config.sheet_header_rows or self.default_header_row is None:
+            return mapping_config.get_header_row(sheet_name)
+        return self.default_header_row
+
+    def get_column_mapping(self, inquiry_type: str, default_mapping: Dict[str, Any]) -> Dict[str, Any]:
+        """기본 컬럼 매핑에 이 스프레드시트의 덮어쓰기 규칙을 적용해 반환합니다."""
+        override = self.column_mappings.get(inquiry_type)
+        if not override:
+            return default_mapping
+        mapping = dict(default_mapping, **override)
+        for key in ('extra_fields', 'converters'):
+            if key in override:
+                mapping[key] = dict(default_mapping.get(key, {}), **override[key])
+        return mapping
+
+    def handles(self, inquiry_type: str) -> bool:
+        """이 스프레드시트에서 해당 inquiry_type을 처리하는지 여부를 반환합니다."""
+        return self.inquiry_types is None or inquiry_type in self.inquiry_types
+
+
+def load_sync_sources(config_path: Optional[str] = None) -> List[SyncSource]:
+    """
+    동기화 대상 스프레드시트 목록을 불러옵니다.
+    SYNC_SOURCES_FILE(JSON 리스트)이 설정되어 있으면 그 파일을, 없으면 GOOGLE_SHEETS_URL 하나를 사용합니다.
+
+    설정 파일 예시:
+        [
+            {"name": "본사", "url": "https://docs.google.com/spreadsheets/d/.../edit"},
+            {"name": "지사", "url": "...", "sheet_name": "접수", "default_header_row": 0}
+        ]
+
+    :param config_path: 설정 파일 경로 (기본값: 환경변수 SYNC_SOURCES_FILE)
+    :return: SyncSource 리스트
+    """
+    config_path = config_path or os.getenv('SYNC_SOURCES_FILE')
+    if not config_path:
+        url = os.getenv('GOOGLE_SHEETS_URL')
+        if not url:
+            raise ValueError("GOOGLE_SHEETS_URL 또는 SYNC_SOURCES_FILE이 설정되지 않았습니다.")
+        return [SyncSource(url)]
+
+    if not os.path.isabs(config_path):
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        config_path = os.path.join(project_root, config_path)
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    sources = [SyncSource(**entry) for entry in entries]
+    logger.info(f"동기화 대상 스프레드시트 {len(sources)}개를 불러왔습니다: {[source.name for source in sources]}")
+    return sources
@@ -0,0 +1,83 @@
+import os
+import json
+import logging
+import threading
+from typing import Any, Optional
+
+
+class SyncStateStore:
+    """동기화 사이에 유지해야 하는 상태(스프레드시트 리비전 등)를 JSON 파일로 관리하는 클래스"""
+
+    def __init__(self, state_path: Optional[str] = None):
+        """
+        SyncStateStore를 초기화합니다.
+
+        :param state_path: 상태 파일 경로 (기본값: 환경변수 SYNC_STATE_FILE 또는 프로젝트 루트의 state/sync_state.json)
+        """
+        self.logger = logging.getLogger(__name__)
+
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.state_path = state_path or os.getenv('SYNC_STATE_FILE') or os.path.join(project_root, 'state', 'sync_state.json')
+        if not os.path.isabs(self.state_path):
+            self.state_path = os.path.join(project_root, self.state_path)
+
+        self._lock = threading.RLock()
+        self._state = self._load()
+
+    def _load(self) -> dict:
+        """상태 파일을 읽습니다. 파일이 없거나 손상된 경우 빈 상태로 시작합니다."""
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"동기화 상태 파일을 읽을 수 없어 빈 상태로 시작합니다: {e}")
+            return {}
+
+    def get(self, *keys: str, default: Any = None) -> Any:
+        """
+        중첩된 키 경로로 값을 조회합니다.
+
+        :param keys: 키 경로 (예: 'spreadsheets', spreadsheet_id, 'revision')
+        :param default: 값이 없을 때 반환할 기본값
+        :return: 저장된 값 또는 기본값
+        """
+        with self._lock:
+            node = self._state
+            for key in keys:
+                if not isinstance(node, dict) or key not in node:
+                    return default
+                node = node[key]
+            return node
+
+    def set(self, *keys: str, value: Any) -> None:
+        """
+        중첩된 키 경로에 값을 저장합니다. 파일에 기록하려면 save()를 호출해야 합니다.
+
+        :param keys: 키 경로
+        :param value: 저장할 값 (JSON 직렬화 가능해야 함)
+        """
+        with self._lock:
+            node = self._state
+            for key in keys[:-1]:
+                node = node.setdefault(key, {})
+            node[keys[-1]] = value
+
+    def save(self) -> bool:
+        """
+        현재 상태를 파일에 기록합니다. 임시 파일에 쓴 뒤 교체하므로 중간에 중단되어도 기존 파일이 손상되지 않습니다.
+
+        :return: 성공 여부 (True/False)
+        """
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+                tmp_path = f"{self.state_path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._state, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.state_path)
+                return True
+            except Exception as e:
+                self.logger.error(f"동기화 상태 저장 실패: {e}")
+                return False
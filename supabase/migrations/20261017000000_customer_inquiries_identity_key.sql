@@ -0,0 +1,71 @@
+-- customer_inquiries 서버 측 중복 제거
+--
+-- 동기화 프로그램의 SUPABASE_WRITE_MODE=upsert 또는 rpc에서 사용합니다.
+-- (inquiry_type, name, phone)이 같은 행은 삽입하지 않고, 실제로 삽입된 행만 반환해 알림에 사용합니다.
+--
+-- 적용 전 확인: 유니크 인덱스는 기존 데이터에 같은 키의 행이 있으면 만들어지지 않습니다.
+-- 프로그램은 이름(앞뒤/연속 공백 정리)과 연락처(숫자만, +82 -> 0)를 정규화해 저장하므로,
+-- 정규화 이전에 저장된 행이 있다면 먼저 정리하고 아래 쿼리 결과가 0건인지 확인하세요.
+--
+--   select inquiry_type, name, phone, count(*)
+--   from public.customer_inquiries
+--   group by inquiry_type, name, phone
+--   having count(*) > 1;
+
+-- 1. 중복 판단 키 (PostgREST upsert의 on_conflict=inquiry_type,name,phone 대상)
+create unique index if not exists customer_inquiries_identity_key
+    on public.customer_inquiries (inquiry_type, name, phone);
+
+-- 2. 중복을 무시하고 삽입한 뒤 실제로 삽입된 행만 반환하는 함수 (SUPABASE_WRITE_MODE=rpc)
+--    records: 삽입할 레코드의 JSON 배열
+--    삽입 컬럼은 고정하지 않고 레코드에 있는 키로 정하므로 column_mappings.json에 추가한 필드도 insert/upsert
+--    방식과 똑같이 저장됩니다. (어느 레코드에도 없는 컬럼은 기본값, 테이블에 없는 키는 insert처럼 오류)
+create or replace function public.insert_customer_inquiries_ignore_duplicates(records jsonb)
+returns setof public.customer_inquiries
+language plpgsql
+as $$
+declare
+    record_keys text[];
+    unknown_keys text[];
+    column_list text;
+begin
+    select coalesce(array_agg(distinct k.key), '{}')
+      into record_keys
+      from jsonb_array_elements(records) as r(item), jsonb_object_keys(r.item) as k(key);
+
+    select array_agg(k.key)
+      into unknown_keys
+      from unnest(record_keys) as k(key)
+     where not exists (
+         select 1 from pg_attribute a
+          where a.attrelid = 'public.customer_inquiries'::regclass
+            and a.attnum > 0 and not a.attisdropped and a.attname = k.key
+     );
+    if unknown_keys is not null then
+        raise exception 'customer_inquiries에 없는 컬럼입니다: %', array_to_string(unknown_keys, ', ')
+            using errcode = 'undefined_column';
+    end if;
+
+    select string_agg(quote_ident(a.attname), ', ' order by a.attnum)
+      into column_list
+      from pg_attribute a
+     where a.attrelid = 'public.customer_inquiries'::regclass
+       and a.attnum > 0 and not a.attisdropped and a.attgenerated = ''
+       and a.attname = any(record_keys);
+    if column_list is null then
+        return;
+    end if;
+
+    return query execute format(
+        'insert into public.customer_inquiries (%1$s) '
+        'select %1$s from jsonb_populate_recordset(null::public.customer_inquiries, $1) '
+        'on conflict (inquiry_type, name, phone) do nothing '
+        'returning *',
+        column_list
+    ) using records;
+end;
+$$;
+
+-- 동기화에 사용하는 service_role 키로만 호출
+revoke execute on function public.insert_customer_inquiries_ignore_duplicates(jsonb) from public, anon, authenticated;
+grant execute on function public.insert_customer_inquiries_ignore_duplicates(jsonb) to service_role;